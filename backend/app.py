@@ -1,51 +1,346 @@
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, current_app, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-import os 
+import os
 from dotenv import load_dotenv
-import psycopg2
-from sponsor_scraper import search_potential_sponsors
-from template_generator import (
-    generate_template_for_specific_sponsor,
-    generate_templates_for_all_sponsors,
-    get_template_content,
-    load_sponsors_data
-)
+# load env before the backend modules below read their settings from it
 load_dotenv()
-# load env 
-from pymongo import MongoClient
+from connections import get_database
+from checkpoint import ScrapeCheckpoint, latest_unfinished_run, list_runs
+from scrape_jobs import ScrapeJobManager, recorded_job, recorded_job_updates
+from sponsor_catalog import get_sponsor_catalog
+from metrics import HTTP_REQUEST_SECONDS, REGISTRY, SLOW_EVENTS
+# Modules that pull in lxml, NumPy, SciPy or pymongo (the scraper, fit scoring,
+# the similarity index and template generation) are imported by the endpoints
+# that use them, so starting a worker stays fast. Measure it with
+# python measure_startup.py
+from bson import ObjectId
+from bson.errors import InvalidId
 import json
+import threading
+import time
 from datetime import datetime
 
-app = Flask(__name__)
-CORS(app)
+api = Blueprint('api', __name__)
 
-# MongoDB connection
-MONGO_URI = os.getenv('MONGODB_URI')
-client = MongoClient(MONGO_URI)
-db = client['ber_scholarship_db']
-sponsors_collection = db['sponsors']
-analyzed_sponsors_collection = db['analyzed_sponsors']
-templates_collection = db['templates']  # New collection for templates
+@api.before_app_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
 
-@app.route('/api/hello', methods=['GET'])
+@api.after_app_request
+def record_request_latency(response):
+    """
+    Record the request's latency per route. For streamed responses this is
+    the time until the response starts.
+    """
+    started = g.get('request_started')
+    if started is not None:
+        # The route pattern, not the path, keeps the label values bounded
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        elapsed = time.perf_counter() - started
+        HTTP_REQUEST_SECONDS.observe(elapsed, endpoint=endpoint, method=request.method, status=response.status_code)
+        SLOW_EVENTS.record('http_request', f'{request.method} {request.full_path.rstrip("?")}', elapsed)
+    return response
+
+# Indexes are created and verified once, when MongoDB is first used, so
+# importing the app and requests that don't touch the database never block on it
+indexes_checked = False
+indexes_lock = threading.Lock()
+
+def check_indexes(db):
+    global indexes_checked
+    if indexes_checked:
+        return
+    with indexes_lock:
+        if indexes_checked:
+            return
+        try:
+            from db_indexes import ensure_indexes
+            missing = ensure_indexes(db)
+        except Exception as e:
+            # e.g. MongoDB is unreachable, the next request tries again
+            print(f"Error ensuring MongoDB indexes: {e}")
+            return
+        # Missing indexes are retried by the next request as well
+        indexes_checked = not missing
+
+def get_collection(name):
+    """
+    Get a collection of the shared database. The first call creates the
+    MongoDB client and makes sure the indexes exist.
+    """
+    db = get_database()
+    check_indexes(db)
+    return db[name]
+
+# Scrape runs execute in the background so web workers stay free
+scrape_jobs = ScrapeJobManager()
+
+# Number of documents per bulk write when saving sponsors and templates
+SCRAPE_UPSERT_BATCH_SIZE = int(os.getenv('SCRAPE_UPSERT_BATCH_SIZE', '500'))
+TEMPLATE_UPSERT_BATCH_SIZE = int(os.getenv('TEMPLATE_UPSERT_BATCH_SIZE', '500'))
+
+def bulk_upsert(collection, documents, key, batch_size):
+    """
+    Upsert documents matched on key using unordered bulk writes of at most
+    batch_size documents each.
+    
+    Returns a list with the matched, modified, upserted and error counts of
+    every batch.
+    """
+    from pymongo import UpdateOne
+    from pymongo.errors import BulkWriteError
+    
+    batches = []
+    for start in range(0, len(documents), batch_size):
+        batch = documents[start:start + batch_size]
+        operations = [
+            UpdateOne({key: document[key]}, {'$set': document}, upsert=True)
+            for document in batch
+        ]
+        
+        try:
+            details = collection.bulk_write(operations, ordered=False).bulk_api_result
+        except BulkWriteError as e:
+            # Unordered writes keep going past failures, e.g. duplicate keys
+            details = e.details
+        
+        batches.append({
+            'size': len(batch),
+            'matched': details.get('nMatched', 0),
+            'modified': details.get('nModified', 0),
+            'upserted': details.get('nUpserted', 0),
+            'errors': len(details.get('writeErrors', []))
+        })
+    return batches
+
+# Page size limits for the paginated read endpoints
+DEFAULT_PAGE_SIZE = int(os.getenv('DEFAULT_PAGE_SIZE', '100'))
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', '1000'))
+
+def read_collection(collection, result_key, default_fields=None, defaults=None, query=None, hidden_fields=None):
+    """
+    Read documents from a collection according to the request's query parameters.
+    Only documents matching query are read, and hidden_fields are left out
+    unless they are asked for in fields.
+    
+    Query parameters:
+        limit: Return one page of at most limit documents
+        cursor: Return the page after this cursor, taken from next_cursor
+        fields: Comma-separated list of fields to return
+        format: 'ndjson' to stream one JSON document per line
+    
+    Pages are keyset-paginated on _id and include a next_cursor, which is
+    null on the last page. NDJSON pages carry it in the X-Next-Cursor
+    header instead, which is left out on the last page. Without limit or
+    cursor, all documents are streamed straight from the Mongo cursor as
+    {"success": true, <result_key>: [...]}, so response memory stays flat
+    however large the collection grows.
+    
+    Raises:
+        bson.errors.InvalidId: If the cursor is malformed
+    """
+    fields = [field for field in request.args.get('fields', '').split(',') if field] or default_fields
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
+    paginate = limit is not None or cursor is not None
+    
+    query = dict(query or {})
+    if cursor:
+        query['_id'] = {'$gt': ObjectId(cursor)}
+    # _id is always returned by Mongo, it is needed for the cursor and dropped below
+    if fields:
+        projection = {field: 1 for field in fields}
+    else:
+        projection = {field: 0 for field in hidden_fields} if hidden_fields else None
+    documents = collection.find(query, projection).sort('_id', 1)
+    if paginate:
+        limit = min(max(limit or DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+        documents = documents.limit(limit)
+    
+    # Defaults for missing fields, limited to the fields being returned
+    field_defaults = {
+        field: value for field, value in (defaults or {}).items()
+        if not fields or field in fields
+    }
+    
+    def clean(document):
+        document.pop('_id', None)
+        for field, value in field_defaults.items():
+            document.setdefault(field, value)
+        return document
+    
+    if paginate:
+        page = list(documents)
+        next_cursor = str(page[-1]['_id']) if len(page) == limit else None
+        if request.args.get('format') == 'ndjson':
+            body = ''.join(current_app.json.dumps(clean(document)) + '\n' for document in page)
+            headers = {'X-Next-Cursor': next_cursor} if next_cursor else {}
+            return Response(body, mimetype='application/x-ndjson', headers=headers)
+        return jsonify({
+            'success': True,
+            result_key: [clean(document) for document in page],
+            'next_cursor': next_cursor
+        })
+    
+    # Pull the first document before streaming so query errors still become
+    # a proper error response
+    first = next(documents, None)
+    
+    if request.args.get('format') == 'ndjson':
+        def ndjson():
+            if first is not None:
+                yield current_app.json.dumps(clean(first)) + '\n'
+            for document in documents:
+                yield current_app.json.dumps(clean(document)) + '\n'
+        return Response(stream_with_context(ndjson()), mimetype='application/x-ndjson')
+    
+    def json_array():
+        yield f'{{"success": true, "{result_key}": ['
+        if first is not None:
+            yield current_app.json.dumps(clean(first))
+            for document in documents:
+                yield ',' + current_app.json.dumps(clean(document))
+        yield ']}'
+    return Response(stream_with_context(json_array()), mimetype='application/json')
+
+@api.route('/api/hello', methods=['GET'])
 def hello():
     return jsonify(message="Hello, World!")
 
-@app.route('/api/scrape', methods=['GET','POST'])
+def run_scrape(checkpoint, force_refresh=False):
+    """
+    Run the scraper and save its results to MongoDB. Executed by scrape jobs.
+    """
+    from sponsor_scraper import search_potential_sponsors
+    from search_cache import get_search_cache
+    from fit_scoring import update_fit_scores
+    from similarity_index import get_similarity_index
+    
+    scraped_data = search_potential_sponsors(force_refresh=force_refresh, checkpoint=checkpoint)
+    # Save scraped data to MongoDB
+    for sponsor in scraped_data:
+        sponsor['created_at'] = datetime.utcnow()
+        # Indexed lowercase name used for partial name lookups
+        sponsor['name_lower'] = sponsor['name'].lower()
+    batches = bulk_upsert(get_collection('sponsors'), scraped_data, 'name', SCRAPE_UPSERT_BATCH_SIZE)
+    # Rescore the saved sponsors whose scoring inputs changed
+    fit_scores = update_fit_scores(
+        get_collection('sponsors'),
+        {'name': {'$in': [sponsor['name'] for sponsor in scraped_data]}}
+    )
+    # Make every process reload its cached sponsor catalog
+    get_sponsor_catalog().mark_changed()
+    # Index the new and changed sponsor texts for similarity search
+    similarity_index = get_similarity_index()
+    similarity = similarity_index.update(scraped_data)
+    similarity_index.save()
+    
+    return {
+        'sponsors_saved': len(scraped_data),
+        'batches': batches,
+        'fit_scores': fit_scores,
+        'similarity_index': similarity,
+        'search_cache': get_search_cache().stats()
+    }
+
+@api.route('/api/scrape', methods=['GET','POST'])
 def scrape():
-    if request.method == 'GET':
-        scraped_data = search_potential_sponsors()
-        # Save scraped data to MongoDB
-        for sponsor in scraped_data:
-            sponsor['created_at'] = datetime.utcnow()
-            sponsors_collection.update_one(
-                {'name': sponsor['name']},
-                {'$set': sponsor},
-                upsert=True
-            )
-        return jsonify(scraped_data)
+    """
+    Start a scrape job in the background and return its id right away.
+    
+    Query parameters:
+        refresh: true to skip cached search results and query Serper again
+        resume: id of an interrupted run to pick up, or 'latest'
+    
+    Poll /api/scrape/jobs/<job_id> or stream /api/scrape/jobs/<job_id>/events
+    to follow its progress.
+    """
+    force_refresh = request.args.get('refresh', '').lower() in ('1', 'true', 'yes')
+    
+    resume_run_id = request.args.get('resume')
+    if resume_run_id == 'latest':
+        resume_run_id = latest_unfinished_run()
+    try:
+        checkpoint = ScrapeCheckpoint.load(resume_run_id) if resume_run_id else ScrapeCheckpoint()
+    except (ValueError, FileNotFoundError):
+        return jsonify({
+            'success': False,
+            'message': f'Scrape run not found: {resume_run_id}'
+        }), 404
+    
+    job = scrape_jobs.start(checkpoint, run_scrape, force_refresh=force_refresh)
+    return jsonify({
+        'success': True,
+        'job_id': job.job_id,
+        'status_url': f'/api/scrape/jobs/{job.job_id}',
+        'events_url': f'/api/scrape/jobs/{job.job_id}/events',
+        'job': job.to_dict()
+    }), 202
+
+@api.route('/api/scrape/jobs/<job_id>', methods=['GET'])
+def get_scrape_job(job_id):
+    """
+    Get the status and progress of a scrape job. Jobs started by another
+    worker process are reported from their checkpoint's progress.
+    """
+    job = scrape_jobs.get(job_id)
+    snapshot = job.to_dict() if job is not None else recorded_job(job_id)
+    if snapshot is None:
+        return jsonify({
+            'success': False,
+            'message': f'Scrape job not found: {job_id}'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'job': snapshot
+    })
+
+@api.route('/api/scrape/jobs/<job_id>/events', methods=['GET'])
+def stream_scrape_job(job_id):
+    """
+    Stream a scrape job's progress as Server-Sent Events until it finishes.
+    Jobs started by another worker process are followed through their
+    checkpoint's progress, and end with an interrupted event if that process
+    dies.
+    """
+    job = scrape_jobs.get(job_id)
+    if job is not None:
+        updates = job.updates()
+    elif recorded_job(job_id) is not None:
+        updates = recorded_job_updates(job_id)
+    else:
+        return jsonify({
+            'success': False,
+            'message': f'Scrape job not found: {job_id}'
+        }), 404
+    
+    def events():
+        for update in updates:
+            if update is None:
+                # Comment line that keeps proxies from closing the connection
+                yield ': keep-alive\n\n'
+                continue
+            event = 'done' if update['status'] in ('completed', 'failed', 'interrupted') else 'progress'
+            yield f'event: {event}\ndata: {json.dumps(update)}\n\n'
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
-@app.route('/api/generate', methods=['POST'])
+@api.route('/api/scrape/runs', methods=['GET'])
+def get_scrape_runs():
+    """
+    Get the progress of all recorded scrape runs, newest first.
+    """
+    return jsonify({
+        'success': True,
+        'runs': list_runs()
+    })
+
+@api.route('/api/generate', methods=['POST'])
 def generate_template():
     """
     Generate an email template for a sponsor.
@@ -62,9 +357,13 @@ def generate_template():
         "team_website": "www.example.com",
         "team_mission": "Team mission statement",
         "specific_aspect": "Specific aspect of the company",
-        "additional_benefits": ["Benefit 1", "Benefit 2", ...]
+        "additional_benefits": ["Benefit 1", "Benefit 2", ...],
+        "save_files": false,  # Optional, also write templates to email_templates/
+        "force": false  # Optional, re-render templates whose inputs did not change
     }
     """
+    from template_generator import render_batch, render_template_for_specific_sponsor, save_template
+    
     try:
         data = request.json
         
@@ -85,8 +384,14 @@ def generate_template():
         # Check if a specific sponsor is requested
         sponsor_name = data.get('sponsor_name')
         
+        # Templates are only written to email_templates/ when asked for
+        save_files = bool(data.get('save_files', False))
+        
+        # Re-render templates even if their inputs did not change
+        force = bool(data.get('force', False))
+        
         # Check if we have any sponsors in the database
-        sponsors_count = sponsors_collection.count_documents({})
+        sponsors_count = get_collection('sponsors').estimated_document_count()
         if sponsors_count == 0:
             return jsonify({
                 'success': False,
@@ -94,8 +399,8 @@ def generate_template():
             }), 404
         
         if sponsor_name:
-            # Generate template for a specific sponsor
-            template_path = generate_template_for_specific_sponsor(
+            # Render template for a specific sponsor in memory
+            rendered = render_template_for_specific_sponsor(
                 sponsor_name=sponsor_name,
                 club_description=club_description,
                 university_description=university_description,
@@ -109,8 +414,10 @@ def generate_template():
                 additional_benefits=additional_benefits
             )
             
-            if template_path:
-                template_content = get_template_content(template_path)
+            if rendered:
+                company_name, template_content = rendered
+                if save_files:
+                    save_template(company_name, template_content)
                 
                 # Save template to MongoDB
                 template_data = {
@@ -135,10 +442,11 @@ def generate_template():
                     }
                 }
                 
-                # Update or insert template
-                templates_collection.update_one(
+                # Update or insert template. The content no longer matches a
+                # stored input hash, so the next batch generation renders it again
+                get_collection('templates').update_one(
                     {'sponsor_name': sponsor_name},
-                    {'$set': template_data},
+                    {'$set': template_data, '$unset': {'input_hash': ''}},
                     upsert=True
                 )
                 
@@ -153,21 +461,32 @@ def generate_template():
                     'message': f'Sponsor "{sponsor_name}" not found'
                 }), 404
         else:
-            # Generate templates for all sponsors
-            template_paths = generate_templates_for_all_sponsors(
-                club_description=club_description,
-                university_description=university_description,
-                user_name=user_name,
-                user_position=user_position,
-                user_email=user_email,
-                user_phone=user_phone,
-                team_website=team_website,
-                team_mission=team_mission,
-                specific_aspect=specific_aspect,
-                additional_benefits=additional_benefits
-            )
+            profile = {
+                'club_description': club_description,
+                'university_description': university_description,
+                'user_name': user_name,
+                'user_position': user_position,
+                'user_email': user_email,
+                'user_phone': user_phone,
+                'team_website': team_website,
+                'team_mission': team_mission,
+                'specific_aspect': specific_aspect,
+                'additional_benefits': additional_benefits
+            }
+            
+            # Stored templates whose inputs are unchanged are not rendered again
+            known_hashes = {}
+            if not force:
+                for document in get_collection('templates').find(
+                    {'input_hash': {'$exists': True}},
+                    {'_id': 0, 'sponsor_name': 1, 'input_hash': 1}
+                ):
+                    known_hashes[document['sponsor_name']] = document['input_hash']
+            
+            # Render templates for all changed sponsors in memory
+            rendered, skipped = render_batch(profile, known_hashes=known_hashes)
             
-            if not template_paths:
+            if not rendered and not skipped:
                 return jsonify({
                     'success': False,
                     'message': 'No templates were generated. Make sure there are sponsors in the database.'
@@ -175,12 +494,15 @@ def generate_template():
             
             # Save all templates to MongoDB
             saved_templates = []
-            for sponsor_name, template_path in template_paths.items():
-                template_content = get_template_content(template_path)
+            template_documents = []
+            for sponsor_name, template_content, _, input_hash in rendered:
+                if save_files:
+                    save_template(sponsor_name, template_content)
                 
                 template_data = {
                     'sponsor_name': sponsor_name,
                     'template_content': template_content,
+                    'input_hash': input_hash,
                     'created_at': datetime.utcnow(),
                     'user_info': {
                         'name': user_name,
@@ -200,22 +522,23 @@ def generate_template():
                     }
                 }
                 
-                # Update or insert template
-                templates_collection.update_one(
-                    {'sponsor_name': sponsor_name},
-                    {'$set': template_data},
-                    upsert=True
-                )
+                template_documents.append(template_data)
                 
                 saved_templates.append({
                     'sponsor_name': sponsor_name,
                     'template_content': template_content
                 })
             
+            # Update or insert all templates in batched bulk writes
+            batches = bulk_upsert(get_collection('templates'), template_documents, 'sponsor_name', TEMPLATE_UPSERT_BATCH_SIZE)
+            
             return jsonify({
                 'success': True,
-                'message': f'Generated and saved {len(saved_templates)} templates',
-                'templates': saved_templates
+                'message': f'Generated and saved {len(saved_templates)} templates, {len(skipped)} unchanged',
+                'templates': saved_templates,
+                'rendered': len(saved_templates),
+                'skipped': len(skipped),
+                'batches': batches
             })
     
     except Exception as e:
@@ -224,30 +547,35 @@ def generate_template():
             'message': f'Error generating template: {str(e)}'
         }), 500
 
-@app.route('/api/templates', methods=['GET'])
+@api.route('/api/templates', methods=['GET'])
 def get_templates():
     """
-    Get all saved templates from MongoDB.
+    Get saved templates from MongoDB.
+    
+    Supports the limit, cursor, fields and format query parameters, see
+    read_collection. Use e.g. ?fields=sponsor_name,created_at to leave out
+    the full template_content.
     """
     try:
-        templates = list(templates_collection.find({}, {'_id': 0}))
+        return read_collection(get_collection('templates'), 'templates')
+    except InvalidId:
         return jsonify({
-            'success': True,
-            'templates': templates
-        })
+            'success': False,
+            'message': 'Invalid cursor'
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
             'message': f'Error loading templates: {str(e)}'
         }), 500
 
-@app.route('/api/templates/<sponsor_name>', methods=['GET'])
+@api.route('/api/templates/<sponsor_name>', methods=['GET'])
 def get_template(sponsor_name):
     """
     Get a specific template by sponsor name.
     """
     try:
-        template = templates_collection.find_one(
+        template = get_collection('templates').find_one(
             {'sponsor_name': sponsor_name},
             {'_id': 0}
         )
@@ -269,55 +597,202 @@ def get_template(sponsor_name):
             'message': f'Error loading template: {str(e)}'
         }), 500
 
-@app.route('/api/sponsors', methods=['GET'])
+@api.route('/api/sponsors', methods=['GET'])
 def get_sponsors():
     """
-    Get a list of all available sponsors from MongoDB.
+    Get available sponsors from MongoDB.
+    
+    Returns name, description and website by default. Supports the limit,
+    cursor, fields and format query parameters, see read_collection.
+    """
+    try:
+        return read_collection(
+            get_collection('sponsors'),
+            'sponsors',
+            default_fields=['name', 'description', 'website'],
+            defaults={'name': 'Unknown Company', 'description': '', 'website': ''}
+        )
+    except InvalidId:
+        return jsonify({
+            'success': False,
+            'message': 'Invalid cursor'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error loading sponsors: {str(e)}'
+        }), 500
+
+@api.route('/api/sponsors/similar', methods=['GET'])
+def get_similar_sponsors():
+    """
+    Find the sponsors most similar to one or more seed sponsors, ranked by
+    cosine similarity of their TF-IDF description and search query vectors.
+    
+    Query parameters:
+        name: Name of a seed sponsor, may be repeated
+        top: Number of sponsors to return, defaults to 10
     """
+    names = request.args.getlist('name')
+    if not names:
+        return jsonify({
+            'success': False,
+            'message': 'Pass at least one seed sponsor as name'
+        }), 400
+    top = min(max(request.args.get('top', 10, type=int), 1), MAX_PAGE_SIZE)
+    
     try:
-        # Get all sponsors from MongoDB
-        sponsors = list(sponsors_collection.find({}, {'_id': 0}))
+        from similarity_index import get_similarity_index
+        similarity_index = get_similarity_index()
+        if not len(similarity_index):
+            # Sponsors saved before the index existed
+            similarity_index.update(get_collection('sponsors').find(
+                {},
+                {'_id': 0, 'name': 1, 'description': 1, 'search_query': 1}
+            ))
+            similarity_index.save()
         
-        # Extract relevant information
-        sponsor_list = []
-        for sponsor in sponsors:
-            name = sponsor.get("name", "Unknown Company")
-            description = sponsor.get("description", "")
-            website = sponsor.get("website", "")
-            
-            sponsor_list.append({
-                'name': name,
-                'description': description,
-                'website': website
-            })
+        similar = similarity_index.similar(names, top)
+        if not similar and not any(name in similarity_index for name in names):
+            return jsonify({
+                'success': False,
+                'message': 'None of the seed sponsors were found'
+            }), 404
         
         return jsonify({
             'success': True,
-            'sponsors': sponsor_list
+            'similar': similar
         })
-    
     except Exception as e:
         return jsonify({
             'success': False,
-            'message': f'Error loading sponsors: {str(e)}'
+            'message': f'Error finding similar sponsors: {str(e)}'
         }), 500
 
-@app.route('/api/analyzed-sponsors', methods=['GET'])
+@api.route('/api/sponsors/cache-stats', methods=['GET'])
+def get_sponsor_cache_stats():
+    """
+    Get hit and staleness metrics of the in-process sponsor catalog cache.
+    """
+    return jsonify({
+        'success': True,
+        'stats': get_sponsor_catalog().stats()
+    })
+
+def read_top_sponsors():
+    """
+    Read the highest scoring sponsors according to the request's query parameters.
+    
+    Query parameters:
+        top: Number of sponsors to return, defaults to DEFAULT_PAGE_SIZE
+        min_score: Only return sponsors scoring at least this much
+        fields: Comma-separated list of fields to return
+    
+    The fit_score_rank index serves both the filter and the sort, so only
+    the returned sponsors are read.
+    """
+    top = min(max(request.args.get('top', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+    min_score = request.args.get('min_score', 0, type=float)
+    fields = [field for field in request.args.get('fields', '').split(',') if field]
+    
+    projection = {field: 1 for field in fields} if fields else {'fit_hash': 0}
+    projection['_id'] = 0
+    documents = get_collection('sponsors').find(
+        {'fit_score': {'$gte': min_score}},
+        projection
+    ).sort([('fit_score', -1), ('name', 1)]).limit(top)
+    
+    return jsonify({
+        'success': True,
+        'analyzed_sponsors': list(documents)
+    })
+
+@api.route('/api/analyzed-sponsors', methods=['GET'])
 def get_analyzed_sponsors():
     """
-    Get a list of all analyzed sponsors from MongoDB.
+    Get analyzed sponsors from MongoDB, i.e. the sponsors that have a fit
+    score stored by update_fit_scores.
+    
+    With top or min_score, returns the highest scoring sponsors ranked by
+    their stored fit score, see read_top_sponsors. Otherwise supports the
+    limit, cursor, fields and format query parameters, see read_collection.
     """
     try:
-        analyzed_sponsors = list(analyzed_sponsors_collection.find({}, {'_id': 0}))
+        if 'top' in request.args or 'min_score' in request.args:
+            return read_top_sponsors()
+        return read_collection(
+            get_collection('sponsors'),
+            'analyzed_sponsors',
+            query={'fit_score': {'$exists': True}},
+            hidden_fields=['fit_hash']
+        )
+    except InvalidId:
+        return jsonify({
+            'success': False,
+            'message': 'Invalid cursor'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error loading analyzed sponsors: {str(e)}'
+        }), 500
+
+@api.route('/api/analyzed-sponsors/rescore', methods=['POST'])
+def rescore_sponsors():
+    """
+    Recompute stored fit scores of sponsors whose scoring inputs or scoring
+    rules changed.
+    
+    Query parameters:
+        force: true to rescore every sponsor
+    """
+    force = request.args.get('force', '').lower() in ('1', 'true', 'yes')
+    try:
+        from fit_scoring import update_fit_scores
+        fit_scores = update_fit_scores(get_collection('sponsors'), force=force)
+        if fit_scores['scored']:
+            get_sponsor_catalog().mark_changed()
         return jsonify({
             'success': True,
-            'analyzed_sponsors': analyzed_sponsors
+            **fit_scores
         })
     except Exception as e:
         return jsonify({
             'success': False,
-            'message': f'Error loading analyzed sponsors: {str(e)}'
+            'message': f'Error scoring sponsors: {str(e)}'
         }), 500
 
+@api.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Get per-stage counters and latency histograms of this process in the
+    Prometheus text format.
+    """
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@api.route('/api/metrics/slow', methods=['GET'])
+def get_slow_events():
+    """
+    Get the slowest searches, site fetches and requests of this process,
+    which the metrics only count per status or route.
+    """
+    return jsonify({
+        'success': True,
+        'slowest': SLOW_EVENTS.snapshot()
+    })
+
+def create_app():
+    """
+    Create the Flask app. Database clients, the scraper and other heavy
+    modules are only loaded by the first request that needs them.
+    """
+    app = Flask(__name__)
+    # Lets browsers read the NDJSON page cursor, see read_collection
+    CORS(app, expose_headers=['X-Next-Cursor'])
+    app.register_blueprint(api)
+    return app
+
+app = create_app()
+
 if __name__ == '__main__':
     app.run(debug=True)
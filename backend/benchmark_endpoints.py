@@ -0,0 +1,230 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from benchmark_scraper import percentiles
+
+# Request payload shared by every generation scenario
+PROFILE = {
+    "club_description": "We design, build and race an electric formula car every year.",
+    "university_description": "A public research university with a strong engineering college.",
+    "user_name": "Benchmark User",
+    "user_position": "Sponsorship Lead",
+    "user_email": "benchmark@example.com",
+    "team_website": "https://example.com",
+    "team_mission": "train the next generation of engineers",
+    "specific_aspect": "electrification",
+    "additional_benefits": ["Logo placement on the car"]
+}
+
+DESCRIPTION_WORDS = (
+    "automotive engineering racing electric vehicle battery technology innovation sustainable "
+    "green energy partner students team performance design manufacturing precision components"
+).split()
+
+
+def current_rss_mb() -> float:
+    """
+    Get the resident set size of this process in MB.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except OSError:
+        # No procfs, fall back to the peak
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def synthetic_sponsors(count: int) -> List[Dict]:
+    """
+    Build count distinct sponsors shaped like scraped ones.
+    """
+    sponsors = []
+    for i in range(count):
+        words = [DESCRIPTION_WORDS[(i * 7 + j * 3) % len(DESCRIPTION_WORDS)] for j in range(20)]
+        name = f"Benchmark Sponsor {i:06d}"
+        sponsors.append({
+            "name": name,
+            "name_lower": name.lower(),
+            "website": f"https://sponsor{i}.example.com/",
+            "description": " ".join(words),
+            "search_query": "companies that sponsor formula student teams",
+            "email": f"partners@sponsor{i}.example.com" if i % 3 else None,
+            "careers_page": f"https://sponsor{i}.example.com/careers" if i % 2 else None
+        })
+    return sponsors
+
+
+def measure(name: str, sponsors: int, repeat: int, call: Callable[[], None]) -> Dict:
+    """
+    Call a scenario repeat times and summarize its latency, throughput and memory.
+    """
+    rss_before = current_rss_mb()
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    elapsed = time.perf_counter() - started
+
+    latency = percentiles(latencies)
+    result = {
+        "sponsors": sponsors,
+        "scenario": name,
+        "requests": repeat,
+        "p50_ms": round(latency[50], 2),
+        "p95_ms": round(latency[95], 2),
+        "p99_ms": round(latency[99], 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2),
+        "throughput_per_sec": round(repeat / elapsed, 2) if elapsed > 0 else None,
+        "rss_delta_mb": round(current_rss_mb() - rss_before, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+    print(f"{sponsors:>7} {name:<38} p50 {result['p50_ms']:>9.2f}ms  p95 {result['p95_ms']:>9.2f}ms  "
+          f"{result['throughput_per_sec']}/s", file=sys.stderr)
+    return result
+
+
+def expect_ok(response) -> None:
+    # Consume streamed bodies so their full cost is measured
+    response.get_data()
+    if response.status_code != 200:
+        body = response.get_data(as_text=True)[:200]
+        raise RuntimeError(f"{response.request.path} returned {response.status_code}: {body}")
+
+
+def seed_catalog(db, sponsors: List[Dict], batch_size: int = 5000) -> None:
+    """
+    Replace the benchmark database's sponsors and templates.
+    """
+    from sponsor_catalog import get_sponsor_catalog
+
+    for collection in ("sponsors", "templates", "meta"):
+        db[collection].delete_many({})
+    for start in range(0, len(sponsors), batch_size):
+        db["sponsors"].insert_many([dict(sponsor) for sponsor in sponsors[start:start + batch_size]])
+    get_sponsor_catalog().mark_changed()
+
+
+def run_size(app, db, size: int, repeat: int, heavy_repeat: int, work_dir: str) -> List[Dict]:
+    """
+    Seed size sponsors and run every scenario against them.
+    """
+    from template_generator import generate_templates_for_all_sponsors
+
+    seed_catalog(db, synthetic_sponsors(size))
+    client = app.test_client()
+    results = []
+
+    def page_through(path: str) -> Callable[[], None]:
+        cursor = {"next": None}
+
+        def call():
+            url = f"{path}?limit=100" + (f"&cursor={cursor['next']}" if cursor["next"] else "")
+            response = client.get(url)
+            expect_ok(response)
+            # Restart from the first page after the last one
+            cursor["next"] = response.get_json()["next_cursor"]
+        return call
+
+    # Cold generation renders every sponsor, warm generation skips them all
+    results.append(measure("POST /api/generate (cold)", size, 1,
+                           lambda: expect_ok(client.post("/api/generate", json=dict(PROFILE, force=True)))))
+    results.append(measure("POST /api/generate (unchanged)", size, heavy_repeat,
+                           lambda: expect_ok(client.post("/api/generate", json=PROFILE))))
+    one_sponsor = dict(PROFILE, sponsor_name=f"Benchmark Sponsor {size // 2:06d}")
+    results.append(measure("POST /api/generate (one sponsor)", size, repeat,
+                           lambda: expect_ok(client.post("/api/generate", json=one_sponsor))))
+
+    results.append(measure("GET /api/sponsors?limit=100", size, repeat, page_through("/api/sponsors")))
+    results.append(measure("GET /api/sponsors (all)", size, heavy_repeat,
+                           lambda: expect_ok(client.get("/api/sponsors"))))
+    results.append(measure("GET /api/templates?limit=100", size, repeat, page_through("/api/templates")))
+    results.append(measure("GET /api/templates (all)", size, heavy_repeat,
+                           lambda: expect_ok(client.get("/api/templates"))))
+
+    output_dir = os.path.join(work_dir, f"email_templates_{size}")
+    results.append(measure("generate_templates_for_all_sponsors", size, 1,
+                           lambda: generate_templates_for_all_sponsors(output_dir=output_dir, **PROFILE)))
+    shutil.rmtree(output_dir, ignore_errors=True)
+    return results
+
+
+def connect(args: argparse.Namespace):
+    """
+    Point the shared MongoDB client at the chosen stand-in.
+    """
+    if args.mongo_uri:
+        # A local mongod, using a database of its own
+        os.environ["MONGODB_URI"] = args.mongo_uri
+        os.environ["MONGODB_DB_NAME"] = args.db_name
+        from connections import get_database
+        return get_database()
+
+    try:
+        import mongomock
+    except ImportError:
+        sys.exit("mongomock is not installed. Run `pip install mongomock` or pass --mongo-uri of a local mongod.")
+
+    from connections import get_database, use_mongo_client
+    use_mongo_client(mongomock.MongoClient())
+    return get_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load-test the read and generate endpoints against a local MongoDB stand-in."
+    )
+    parser.add_argument("--sizes", help="comma-separated sponsor counts to seed, defaults to 1000,10000,100000 "
+                                        "with --mongo-uri and 1000,10000 with mongomock")
+    parser.add_argument("--requests", type=int, default=50, help="requests per paged or single-sponsor scenario")
+    parser.add_argument("--heavy-requests", type=int, default=3, help="requests per full-catalog scenario")
+    parser.add_argument("--mongo-uri", help="use a local mongod instead of the in-process mongomock")
+    parser.add_argument("--db-name", default="ber_scholarship_benchmark", help="database used with --mongo-uri, dropped afterwards")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    # mongomock has no real indexes, so every keyed write scans the collection
+    # and cold generation grows quadratically. Its numbers are for comparing
+    # runs with each other, use a local mongod for absolute ones.
+    default_sizes = "1000,10000,100000" if args.mongo_uri else "1000,10000"
+    sizes = [int(size) for size in (args.sizes or default_sizes).split(",") if size]
+    db = connect(args)
+
+    from app import create_app
+    app = create_app()
+
+    work_dir = tempfile.mkdtemp(prefix="endpoint-benchmark-")
+    results = []
+    try:
+        for size in sizes:
+            results.extend(run_size(app, db, size, args.requests, args.heavy_requests, work_dir))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if args.mongo_uri:
+            db.client.drop_database(args.db_name)
+
+    report = {
+        "backend": "mongod" if args.mongo_uri else "mongomock",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
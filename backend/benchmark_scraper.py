@@ -0,0 +1,207 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from stand_in_server import BACKEND_DIR, add_server_arguments
+
+# Lower is better for these metrics, higher is better for the rest
+LOWER_IS_BETTER = ("fetch_latency_p50_ms", "fetch_latency_p95_ms", "fetch_latency_p99_ms", "peak_rss_mb")
+GATED_METRICS = ("queries_per_sec", "sites_per_sec") + LOWER_IS_BETTER
+
+
+class CallTimer:
+    """
+    Records the start and end time of every call to a wrapped function.
+    """
+
+    def __init__(self):
+        self.calls: List[Tuple[float, float, bool]] = []
+        self._lock = threading.Lock()
+
+    def wrap(self, fn: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                with self._lock:
+                    self.calls.append((start, time.perf_counter(), failed))
+        return timed
+
+    def throughput(self) -> float:
+        """
+        Calls per second between the first call starting and the last ending.
+        """
+        if not self.calls:
+            return 0.0
+        elapsed = max(end for _, end, _ in self.calls) - min(start for start, _, _ in self.calls)
+        return len(self.calls) / elapsed if elapsed > 0 else 0.0
+
+    def latencies_ms(self) -> List[float]:
+        return [(end - start) * 1000 for start, end, _ in self.calls]
+
+
+def percentiles(values: List[float]) -> Dict[int, float]:
+    """
+    Get the 50th, 95th and 99th percentile of values.
+    """
+    if not values:
+        return {50: 0.0, 95: 0.0, 99: 0.0}
+    if len(values) == 1:
+        return {50: values[0], 95: values[0], 99: values[0]}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {50: cuts[49], 95: cuts[94], 99: cuts[98]}
+
+
+def start_stand_in(args: argparse.Namespace) -> Tuple[subprocess.Popen, Dict]:
+    """
+    Start the stand-in server in its own process, so it doesn't count
+    towards the scraper's memory or CPU.
+    """
+    command = [
+        sys.executable, os.path.join(BACKEND_DIR, "stand_in_server.py"),
+        "--results-per-query", str(args.results_per_query),
+        "--page-kb", str(args.page_kb),
+        "--page-sigma", str(args.page_sigma),
+        "--latency-ms", str(args.latency_ms),
+        "--latency-sigma", str(args.latency_sigma),
+        "--serper-latency-ms", str(args.serper_latency_ms),
+        "--seed", str(args.seed)
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    info = json.loads(process.stdout.readline())
+    return process, info
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict:
+    """
+    Run the scrape pipeline once against the stand-in and measure it.
+    """
+    server, info = start_stand_in(args)
+    work_dir = tempfile.mkdtemp(prefix="scraper-benchmark-")
+    try:
+        # Point every external dependency at the stand-in or at scratch
+        # space. These must be set before the scraper modules are imported.
+        os.environ.update({
+            "SERPER_SEARCH_URL": info["serper_url"],
+            "SERPER_API_KEY": "benchmark",
+            "HTTP_CACHE_DIR": os.path.join(work_dir, "http_cache"),
+            "SEARCH_CACHE_PATH": os.path.join(work_dir, "search_cache.sqlite3"),
+            "SCRAPE_RUNS_DIR": os.path.join(work_dir, "runs"),
+            "SCRAPER_DATA_DIR": os.path.join(work_dir, "data"),
+        })
+        # Never send loopback traffic through a configured proxy
+        for name in ("no_proxy", "NO_PROXY"):
+            os.environ[name] = ",".join(filter(None, [os.environ.get(name), "127.0.0.0/8"]))
+        if args.serper_rate_limit:
+            os.environ["SERPER_RATE_LIMIT"] = str(args.serper_rate_limit)
+            os.environ["SERPER_BURST"] = str(args.serper_rate_limit)
+
+        import sponsor_scraper
+
+        search_timer = CallTimer()
+        fetch_timer = CallTimer()
+        sponsor_scraper.perform_search = search_timer.wrap(sponsor_scraper.perform_search)
+        sponsor_scraper.fetch_page = fetch_timer.wrap(sponsor_scraper.fetch_page)
+
+        started = time.perf_counter()
+        output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with output:
+            sponsors = sponsor_scraper.search_potential_sponsors(force_refresh=True)
+        elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+
+    latency = percentiles(fetch_timer.latencies_ms())
+    return {
+        "config": {
+            "results_per_query": args.results_per_query,
+            "page_kb": args.page_kb,
+            "page_sigma": args.page_sigma,
+            "latency_ms": args.latency_ms,
+            "latency_sigma": args.latency_sigma,
+            "serper_latency_ms": args.serper_latency_ms,
+            "seed": args.seed,
+            "sites": info["sites"]
+        },
+        "queries": len(search_timer.calls),
+        "pages_fetched": len(fetch_timer.calls),
+        "fetch_errors": sum(1 for _, _, failed in fetch_timer.calls if failed),
+        "sponsors_found": len(sponsors),
+        "elapsed_sec": round(elapsed, 3),
+        "queries_per_sec": round(search_timer.throughput(), 2),
+        "sites_per_sec": round(fetch_timer.throughput(), 2),
+        "fetch_latency_p50_ms": round(latency[50], 1),
+        "fetch_latency_p95_ms": round(latency[95], 1),
+        "fetch_latency_p99_ms": round(latency[99], 1),
+        # ru_maxrss is in KB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+
+def find_regressions(result: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Compare a result with a baseline result.
+
+    Returns:
+        Descriptions of the metrics that got worse by more than tolerance
+    """
+    regressions = []
+    for metric in GATED_METRICS:
+        expected = baseline.get(metric)
+        if not expected:
+            continue
+        actual = result[metric]
+        if metric in LOWER_IS_BETTER:
+            worse = actual > expected * (1 + tolerance)
+        else:
+            worse = actual < expected * (1 - tolerance)
+        if worse:
+            regressions.append(f"{metric}: {actual} vs baseline {expected}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the scrape pipeline offline against a local Serper and website stand-in."
+    )
+    add_server_arguments(parser)
+    parser.add_argument("--serper-rate-limit", type=float, help="override SERPER_RATE_LIMIT and SERPER_BURST")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    parser.add_argument("--baseline", help="results JSON of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression against the baseline")
+    parser.add_argument("--verbose", action="store_true", help="show the scraper's output")
+    args = parser.parse_args()
+
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    result = run_benchmark(args)
+    print(json.dumps(result, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        regressions = find_regressions(result, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,233 @@
+import json
+import os
+import pathlib
+import re
+import threading
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BACKEND_DIR = pathlib.Path(__file__).parent.absolute()
+RUNS_DIR = os.getenv("SCRAPE_RUNS_DIR", os.path.join(BACKEND_DIR, "data", "runs"))
+
+RUN_ID_PATTERN = re.compile(r'^[\w-]+$')
+
+# A queued or running run whose run.json hasn't been written for this many
+# seconds is taken to be interrupted, e.g. because its worker process died.
+# Live jobs refresh it regularly, see ScrapeJobManager.
+RUN_STALE_SECONDS = int(os.getenv("SCRAPE_RUN_STALE_SECONDS", "120"))
+
+
+class ScrapeCheckpoint:
+    """
+    Incremental checkpoint of one scrape run.
+
+    Every successful search and every fetched page is appended to a JSON lines
+    file as soon as it completes, and run.json keeps the run's progress. A run
+    that was interrupted can be loaded again to skip the work it already did.
+    """
+
+    def __init__(self, run_id: str = None, runs_dir: str = None):
+        """
+        Args:
+            run_id: Id of the run, a new one is generated if not given
+            runs_dir: Directory holding all runs, defaults to RUNS_DIR
+        """
+        self.run_id = run_id or f"{datetime.utcnow():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+        if not RUN_ID_PATTERN.match(self.run_id):
+            raise ValueError(f"Invalid run id: {self.run_id}")
+
+        self.run_dir = os.path.join(runs_dir or RUNS_DIR, self.run_id)
+        self.completed_queries: Dict[str, Dict] = {}
+        self.fetched: Dict[str, Dict] = {}
+        self.progress = {
+            "run_id": self.run_id,
+            "status": "running",
+            "started_at": datetime.utcnow().isoformat(),
+            "updated_at": None,
+            "queries_total": 0,
+            "queries_done": 0,
+            "sites_fetched": 0,
+            "sponsors_found": 0
+        }
+        # Called with a copy of the progress every time it is saved
+        self.on_progress: Optional[Callable[[Dict], None]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, run_id: str, runs_dir: str = None) -> "ScrapeCheckpoint":
+        """
+        Load the checkpoint of an earlier run so it can be resumed.
+
+        Raises:
+            ValueError: If the run id is malformed
+            FileNotFoundError: If no run with this id exists
+        """
+        checkpoint = cls(run_id, runs_dir)
+        with open(os.path.join(checkpoint.run_dir, "run.json"), encoding="utf-8") as f:
+            checkpoint.progress.update(json.load(f))
+
+        for record in checkpoint._read_records("queries.jsonl"):
+            checkpoint.completed_queries[record["query"]] = record["results"]
+        for record in checkpoint._read_records("fetches.jsonl"):
+            checkpoint.fetched[record["url"]] = record["contact_info"]
+
+        checkpoint.progress["status"] = "running"
+        return checkpoint
+
+    def _read_records(self, filename: str) -> List[Dict]:
+        path = os.path.join(self.run_dir, filename)
+        if not os.path.exists(path):
+            return []
+
+        records = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # The run was killed halfway through writing this line
+                    break
+        return records
+
+    def _append_record(self, filename: str, record: Dict) -> None:
+        os.makedirs(self.run_dir, exist_ok=True)
+        with open(os.path.join(self.run_dir, filename), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def _save_progress(self, notify: bool = True) -> None:
+        os.makedirs(self.run_dir, exist_ok=True)
+        self.progress["updated_at"] = datetime.utcnow().isoformat()
+        path = os.path.join(self.run_dir, "run.json")
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(self.progress, f, indent=2)
+        os.replace(f"{path}.tmp", path)
+        if notify and self.on_progress:
+            self.on_progress(dict(self.progress))
+
+    def start(self, queries_total: int) -> None:
+        """
+        Record the start of the run, or of its resumption.
+        """
+        with self._lock:
+            self.progress["status"] = "running"
+            self.progress["queries_total"] = queries_total
+            self.progress["queries_done"] = len(self.completed_queries)
+            self.progress["sites_fetched"] = len(self.fetched)
+            self._save_progress()
+
+    def recording_search(self, search_fn: Callable[[str], Optional[Dict]]) -> Callable[[str], Optional[Dict]]:
+        """
+        Wrap a search function so every successful search is checkpointed.
+        """
+        def search(query: str) -> Optional[Dict]:
+            results = search_fn(query)
+            if results is not None:
+                with self._lock:
+                    self.completed_queries[query] = results
+                    self._append_record("queries.jsonl", {"query": query, "results": results})
+                    self.progress["queries_done"] = len(self.completed_queries)
+                    self._save_progress()
+            return results
+        return search
+
+    def recording_fetch(self, fetch_fn: Callable[[str], Dict]) -> Callable[[str], Dict]:
+        """
+        Wrap a page fetch function so fetched pages are checkpointed and pages
+        fetched by the interrupted run are replayed instead of fetched again.
+
+        Empty results, which extract_contact_info returns for failed or timed
+        out fetches, aren't checkpointed, so a resumed run retries those sites.
+        """
+        def fetch(url: str) -> Dict:
+            with self._lock:
+                if url in self.fetched:
+                    return self.fetched[url]
+
+            contact_info = fetch_fn(url)
+            if not contact_info:
+                return contact_info
+            with self._lock:
+                self.fetched[url] = contact_info
+                self._append_record("fetches.jsonl", {"url": url, "contact_info": contact_info})
+                self.progress["sites_fetched"] = len(self.fetched)
+                self._save_progress()
+            return contact_info
+        return fetch
+
+    def heartbeat(self) -> None:
+        """
+        Refresh updated_at in run.json, so other processes can tell the run
+        is still alive. Progress listeners aren't notified.
+        """
+        with self._lock:
+            self._save_progress(notify=False)
+
+    def update(self, **progress) -> None:
+        """
+        Update progress counters, e.g. sponsors_found.
+        """
+        with self._lock:
+            self.progress.update(progress)
+            self._save_progress()
+
+    def finish(self, sponsors_found: int) -> None:
+        """
+        Mark the run as completed.
+        """
+        self.update(status="completed", sponsors_found=sponsors_found)
+
+
+def read_run(run_id: str, runs_dir: str = None) -> Optional[Dict]:
+    """
+    Get the recorded progress of a run, or None if there is no such run.
+    """
+    if not RUN_ID_PATTERN.match(run_id):
+        return None
+    path = os.path.join(runs_dir or RUNS_DIR, run_id, "run.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def list_runs(runs_dir: str = None) -> List[Dict]:
+    """
+    Get the progress of every recorded run, newest first.
+    """
+    runs_dir = runs_dir or RUNS_DIR
+    if not os.path.isdir(runs_dir):
+        return []
+
+    runs = [read_run(run_id, runs_dir) for run_id in os.listdir(runs_dir)]
+    runs = [run for run in runs if run is not None]
+    runs.sort(key=lambda run: run.get("started_at") or "", reverse=True)
+    return runs
+
+
+def is_run_active(run: Dict, stale_after: float = None) -> bool:
+    """
+    Check whether a run is queued or running in some process, judging by
+    how recently its run.json was written.
+    """
+    if run.get("status") not in ("queued", "running") or not run.get("updated_at"):
+        return False
+    stale_after = RUN_STALE_SECONDS if stale_after is None else stale_after
+    age = datetime.utcnow() - datetime.fromisoformat(run["updated_at"])
+    return age.total_seconds() < stale_after
+
+
+def latest_unfinished_run(runs_dir: str = None) -> Optional[str]:
+    """
+    Get the id of the most recent run that did not complete and isn't
+    still being executed by another worker process, if any.
+    """
+    for run in list_runs(runs_dir):
+        if run.get("status") != "completed" and not is_run_active(run):
+            return run["run_id"]
+    return None
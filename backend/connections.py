@@ -0,0 +1,113 @@
+import os
+import threading
+from typing import TYPE_CHECKING
+
+from dotenv import load_dotenv
+
+# requests and pymongo are imported when the first session or client is
+# created, so importing this module stays cheap for processes that never
+# connect
+if TYPE_CHECKING:
+    import requests
+    from pymongo import MongoClient
+    from pymongo.database import Database
+
+load_dotenv()
+
+# Serper is a single host, so one pool holds all its keep-alive connections.
+# Size it to the number of concurrent searches.
+SERPER_POOL_SIZE = int(os.getenv("SERPER_POOL_SIZE", os.getenv("SEARCH_MAX_WORKERS", "8")))
+
+# Sponsor sites are many hosts fetched at most one request at a time each, so
+# the site session keeps pools for many hosts with few connections per host
+SITE_POOL_HOSTS = int(os.getenv("SITE_POOL_HOSTS", "256"))
+SITE_POOL_SIZE_PER_HOST = int(os.getenv("SITE_POOL_SIZE_PER_HOST", "2"))
+
+# MongoDB connection pool limits, shared by every module in the process
+MONGO_URI = os.getenv("MONGODB_URI")
+MONGO_DB_NAME = os.getenv("MONGODB_DB_NAME", "ber_scholarship_db")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+
+_lock = threading.Lock()
+_serper_session = None
+_site_session = None
+_mongo_client = None
+
+
+def _pooled_session(pool_connections: int, pool_maxsize: int) -> "requests.Session":
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    # pool_block=False opens an extra, short-lived connection instead of
+    # stalling when a pool is exhausted
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=False)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_serper_session() -> "requests.Session":
+    """
+    Get the keep-alive session used for Serper API calls.
+    """
+    global _serper_session
+    with _lock:
+        if _serper_session is None:
+            _serper_session = _pooled_session(1, SERPER_POOL_SIZE)
+        return _serper_session
+
+
+def get_site_session() -> "requests.Session":
+    """
+    Get the keep-alive session used to fetch sponsor websites.
+    """
+    global _site_session
+    with _lock:
+        if _site_session is None:
+            _site_session = _pooled_session(SITE_POOL_HOSTS, SITE_POOL_SIZE_PER_HOST)
+        return _site_session
+
+
+def get_mongo_client() -> "MongoClient":
+    """
+    Get the process-wide MongoDB client.
+
+    MongoClient is thread-safe and pools its own connections, so every module
+    shares this one instead of opening its own pool.
+    """
+    global _mongo_client
+    with _lock:
+        if _mongo_client is None:
+            from pymongo import MongoClient
+
+            from metrics import mongo_command_listener
+
+            _mongo_client = MongoClient(
+                MONGO_URI,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+                # Times every read and write for /api/metrics
+                event_listeners=[mongo_command_listener()]
+            )
+        return _mongo_client
+
+
+def get_database() -> "Database":
+    """
+    Get the application database from the shared client.
+    """
+    return get_mongo_client()[MONGO_DB_NAME]
+
+
+def use_mongo_client(client: "MongoClient") -> None:
+    """
+    Replace the shared MongoDB client, e.g. with an in-process stand-in such
+    as mongomock for benchmarks. Must be called before the first query.
+    """
+    global _mongo_client
+    with _lock:
+        _mongo_client = client
@@ -0,0 +1,81 @@
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+# Indexes the backend relies on, per collection
+INDEX_PLAN = {
+    'sponsors': [
+        # Upserts from /api/scrape and exact sponsor lookups
+        IndexModel([('name', ASCENDING)], name='name_unique', unique=True),
+        # Case-insensitive prefix matching in template generation
+        IndexModel([('name_lower', ASCENDING)], name='name_lower'),
+        # Whole-word matching in template generation when no prefix matches
+        IndexModel([('name', TEXT)], name='name_text'),
+        # Top-k ranking in /api/analyzed-sponsors, name breaks ties
+        IndexModel([('fit_score', DESCENDING), ('name', ASCENDING)], name='fit_score_rank'),
+    ],
+    'templates': [
+        # Upserts from /api/generate and /api/templates/<sponsor_name>
+        IndexModel([('sponsor_name', ASCENDING)], name='sponsor_name_unique', unique=True),
+    ],
+}
+
+
+def backfill_name_lower(db) -> int:
+    """
+    Set name_lower on sponsors saved before the field existed.
+
+    Returns:
+        Number of sponsors updated
+    """
+    result = db['sponsors'].update_many(
+        {'name_lower': {'$exists': False}, 'name': {'$type': 'string'}},
+        [{'$set': {'name_lower': {'$toLower': '$name'}}}]
+    )
+    return result.modified_count
+
+
+def ensure_indexes(db) -> Dict[str, List[str]]:
+    """
+    Create the indexes in INDEX_PLAN and check that they all exist.
+
+    Args:
+        db: MongoDB database
+
+    Returns:
+        Dictionary mapping collection names to the names of missing indexes
+    """
+    try:
+        backfill_name_lower(db)
+    except OperationFailure as e:
+        print(f"Error backfilling sponsors.name_lower: {e}")
+
+    # One call per index, so an index that can't be built doesn't keep the
+    # others from being created
+    for collection_name, indexes in INDEX_PLAN.items():
+        for index in indexes:
+            try:
+                db[collection_name].create_indexes([index])
+            except OperationFailure as e:
+                # e.g. duplicate names left over from before the unique index
+                print(f"Error creating index {index.document['name']} on {collection_name}: {e}")
+
+    return verify_indexes(db)
+
+
+def verify_indexes(db) -> Dict[str, List[str]]:
+    """
+    Check which indexes from INDEX_PLAN are missing.
+
+    Returns:
+        Dictionary mapping collection names to the names of missing indexes
+    """
+    missing = {}
+    for collection_name, indexes in INDEX_PLAN.items():
+        existing = set(db[collection_name].index_information())
+        absent = [index.document['name'] for index in indexes if index.document['name'] not in existing]
+        if absent:
+            print(f"Missing indexes on {collection_name}: {', '.join(absent)}")
+            missing[collection_name] = absent
+    return missing
@@ -0,0 +1,150 @@
+import ipaddress
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Second-level public suffixes under which the registrable domain has three
+# labels, e.g. example.co.uk rather than co.uk
+MULTI_PART_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "ltd.uk", "plc.uk",
+    "com.au", "net.au", "org.au", "edu.au",
+    "co.nz", "org.nz", "co.jp", "ne.jp", "or.jp", "co.kr", "co.in",
+    "com.br", "com.cn", "com.mx", "com.tr", "com.sg", "com.hk", "co.za"
+}
+
+# Shared platforms that host pages about many different companies. Results on
+# these domains are only merged by name, never by domain.
+SHARED_DOMAINS = {
+    "reddit.com", "quora.com", "linkedin.com", "facebook.com", "twitter.com",
+    "x.com", "instagram.com", "youtube.com", "wikipedia.org", "medium.com",
+    "google.com"
+}
+
+# Legal-form suffixes ignored when comparing company names
+COMPANY_SUFFIXES = re.compile(
+    r'\b(inc|incorporated|llc|ltd|limited|gmbh|ag|corp|corporation|co|company|plc|sa)\b$'
+)
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a company name for comparison.
+
+    Args:
+        name: Company name as extracted from a search result title
+
+    Returns:
+        Lowercased name without punctuation or legal-form suffix
+    """
+    normalized = re.sub(r'[^\w\s]', ' ', name.lower())
+    normalized = re.sub(r'\s+', ' ', normalized).strip()
+    normalized = COMPANY_SUFFIXES.sub('', normalized).strip()
+    return normalized
+
+
+def registrable_domain(url: str) -> Optional[str]:
+    """
+    Get the registrable domain of a URL, e.g. mwswire.com for
+    https://www.mwswire.com/contact/.
+
+    Args:
+        url: Website URL
+
+    Returns:
+        Registrable domain or None if the URL has no host. IP addresses are
+        returned whole.
+    """
+    host = urlparse(url).hostname
+    if not host:
+        return None
+
+    try:
+        return str(ipaddress.ip_address(host))
+    except ValueError:
+        pass
+
+    labels = host.lower().rstrip('.').split('.')
+    if len(labels) >= 3 and '.'.join(labels[-2:]) in MULTI_PART_SUFFIXES:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+class SponsorIndex:
+    """
+    Hash index of sponsors keyed on normalized name and registrable domain.
+
+    Adding a sponsor that matches an existing entry on either key merges it
+    into that entry instead of creating a duplicate.
+    """
+
+    def __init__(self):
+        self.sponsors: List[Dict] = []
+        self._by_name: Dict[str, Dict] = {}
+        self._by_domain: Dict[str, Dict] = {}
+
+    def __len__(self) -> int:
+        return len(self.sponsors)
+
+    def _keys(self, sponsor_info: Dict) -> Tuple[Optional[str], Optional[str]]:
+        name_key = normalize_name(sponsor_info.get("name", "")) or None
+        domain_key = registrable_domain(sponsor_info.get("website") or "")
+        if domain_key in SHARED_DOMAINS:
+            domain_key = None
+        return name_key, domain_key
+
+    def find(self, sponsor_info: Dict) -> Optional[Dict]:
+        """
+        Find the existing entry for the same company, if any.
+        """
+        name_key, domain_key = self._keys(sponsor_info)
+        if domain_key and domain_key in self._by_domain:
+            return self._by_domain[domain_key]
+        if name_key and name_key in self._by_name:
+            return self._by_name[name_key]
+        return None
+
+    def add(self, sponsor_info: Dict) -> bool:
+        """
+        Add a sponsor, merging it into an existing entry for the same company.
+
+        Args:
+            sponsor_info: Sponsor dictionary
+
+        Returns:
+            True if the sponsor is new, False if it was merged
+        """
+        name_key, domain_key = self._keys(sponsor_info)
+        existing = self.find(sponsor_info)
+
+        if existing is None:
+            self.sponsors.append(sponsor_info)
+            existing = sponsor_info
+            is_new = True
+        else:
+            merge_sponsor(existing, sponsor_info)
+            is_new = False
+
+        # Index the merged entry under both keys so later aliases resolve to it
+        if name_key:
+            self._by_name.setdefault(name_key, existing)
+        if domain_key:
+            self._by_domain.setdefault(domain_key, existing)
+        return is_new
+
+
+def merge_sponsor(existing: Dict, duplicate: Dict) -> None:
+    """
+    Merge a duplicate sponsor entry into the existing one in place.
+
+    Empty fields of the existing entry are filled from the duplicate and the
+    duplicate's name is kept as an alias.
+    """
+    for key, value in duplicate.items():
+        if value and not existing.get(key):
+            existing[key] = value
+
+    name = duplicate.get("name")
+    if name and name != existing.get("name"):
+        aliases = existing.setdefault("aliases", [])
+        if name not in aliases:
+            aliases.append(name)
@@ -0,0 +1,103 @@
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Maximum number of sponsor websites fetched at the same time
+SITE_FETCH_MAX_WORKERS = int(os.getenv("SITE_FETCH_MAX_WORKERS", "16"))
+
+
+def host_key(url: str) -> str:
+    """
+    Get the host a URL points at, used to group fetches per host.
+    """
+    return urlparse(url).netloc.lower()
+
+
+class FetchPool:
+    """
+    Worker pool for fetching websites concurrently.
+
+    Fetches are queued per host and each host's queue is drained by a single
+    worker at a time, so no host is ever hit by two requests at once. The
+    number of hosts being fetched concurrently is capped by max_workers.
+    """
+
+    def __init__(self, max_workers: int = None):
+        """
+        Args:
+            max_workers: Global concurrency cap, defaults to SITE_FETCH_MAX_WORKERS
+        """
+        self.max_workers = max_workers or SITE_FETCH_MAX_WORKERS
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._lock = threading.Lock()
+        self._host_queues: Dict[str, deque] = {}
+        self._pending = 0
+        self._results: "queue.Queue[Tuple[Any, Any, Optional[Exception]]]" = queue.Queue()
+
+    def submit(self, url: str, fetch_fn: Callable[[str], Any], tag: Any = None) -> None:
+        """
+        Queue a fetch of url with fetch_fn. The tag is handed back with the result.
+        """
+        host = host_key(url)
+        with self._lock:
+            self._pending += 1
+            host_queue = self._host_queues.get(host)
+            if host_queue is not None:
+                # A worker is already draining this host, it will pick this up
+                host_queue.append((url, fetch_fn, tag))
+                return
+            self._host_queues[host] = deque([(url, fetch_fn, tag)])
+        self._executor.submit(self._drain_host, host)
+
+    def _drain_host(self, host: str) -> None:
+        """
+        Run the queued fetches for one host, one after another.
+        """
+        while True:
+            with self._lock:
+                host_queue = self._host_queues[host]
+                if not host_queue:
+                    del self._host_queues[host]
+                    return
+                url, fetch_fn, tag = host_queue.popleft()
+
+            try:
+                self._results.put((tag, fetch_fn(url), None))
+            except Exception as e:
+                self._results.put((tag, None, e))
+
+    def results(self) -> Iterator[Tuple[Any, Any, Optional[Exception]]]:
+        """
+        Yield (tag, result, error) tuples in the order fetches finish.
+
+        Iteration ends once every submitted fetch has been yielded, including
+        fetches submitted while iterating.
+        """
+        while True:
+            with self._lock:
+                if self._pending == 0:
+                    return
+            item = self._results.get()
+            with self._lock:
+                self._pending -= 1
+            yield item
+
+    def close(self) -> None:
+        """
+        Shut down the worker threads.
+        """
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "FetchPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
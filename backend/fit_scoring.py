@@ -0,0 +1,338 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+from metrics import FIT_SCORED_SPONSORS, FIT_SCORING_SECONDS
+
+load_dotenv()
+
+# Sector keywords that suggest a company fits a Formula SAE electric team
+FIT_KEYWORDS = ["automotive", "engineering", "racing", "electric", "vehicle", "battery",
+                "technology", "innovation", "sustainable", "green", "energy"]
+
+KEYWORD_WEIGHT = 5
+CAREERS_WEIGHT = 10
+SOCIAL_WEIGHT = 5
+CONTACT_WEIGHT = 10
+MAX_SCORE = 100
+
+# Sponsor fields the fit score depends on
+FIT_FIELDS = ("description", "careers_page", "social_media", "email", "phone", "contact_page")
+
+# Sponsors scored and written per bulk write in update_fit_scores
+FIT_SCORE_BATCH_SIZE = int(os.getenv("FIT_SCORE_BATCH_SIZE", "1000"))
+
+# Feature rows kept per keyword list, about 120 bytes each
+FIT_FEATURE_CACHE_SIZE = int(os.getenv("FIT_FEATURE_CACHE_SIZE", "500000"))
+
+
+class FeatureCache:
+    """
+    Least recently used feature matrix rows, keyed by fit_features_hash() of
+    the sponsor they were built from.
+    """
+
+    def __init__(self, capacity: int = None):
+        self.capacity = FIT_FEATURE_CACHE_SIZE if capacity is None else capacity
+        self._rows: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Sequence[str]) -> List:
+        """
+        Get the cached row of every key, None where it isn't cached.
+        """
+        rows = []
+        with self._lock:
+            for key in keys:
+                row = self._rows.get(key)
+                if row is not None:
+                    self._rows.move_to_end(key)
+                rows.append(row)
+        return rows
+
+    def put_many(self, items: Sequence[Tuple[str, bytes]]) -> None:
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            for key, row in items:
+                self._rows[key] = row
+                self._rows.move_to_end(key)
+            while len(self._rows) > self.capacity:
+                self._rows.popitem(last=False)
+
+
+# One cache per keyword list, shared by scorers that only differ in weights
+_feature_caches: Dict[Tuple[str, ...], FeatureCache] = {}
+_feature_caches_lock = threading.Lock()
+
+
+def get_feature_cache(keywords: Sequence[str]) -> FeatureCache:
+    with _feature_caches_lock:
+        return _feature_caches.setdefault(tuple(keywords), FeatureCache())
+
+
+class FitScorer:
+    """
+    Scores sponsors against the keyword list and their available contact
+    details.
+
+    All keywords are compiled into one case-insensitive regex that matches
+    whole words only (plus a plural "s"), so "green" no longer matches inside
+    "agreement" and each description is scanned once. Sponsors are turned
+    into a 0/1 feature matrix with one column per keyword followed by the
+    careers page, social media and contact columns, and scores are the
+    matrix product with the weight vector. Feature rows are cached by the
+    hash of the sponsor's fields and shared with scorers using the same
+    keywords, so re-scoring after a weight change skips the regex pass.
+    """
+
+    def __init__(
+        self,
+        keywords: Sequence[str] = None,
+        keyword_weights: Sequence[float] = None,
+        careers_weight: float = CAREERS_WEIGHT,
+        social_weight: float = SOCIAL_WEIGHT,
+        contact_weight: float = CONTACT_WEIGHT,
+        max_score: float = MAX_SCORE
+    ):
+        """
+        Args:
+            keywords: Keywords to look for in descriptions, defaults to FIT_KEYWORDS
+            keyword_weights: Points per keyword, defaults to KEYWORD_WEIGHT for each
+            careers_weight: Points for having a careers page
+            social_weight: Points for having social media links
+            contact_weight: Points for having an email, phone number or contact page
+            max_score: Cap applied to every score
+        """
+        self.keywords = [keyword.lower() for keyword in (keywords or FIT_KEYWORDS)]
+        if keyword_weights is None:
+            keyword_weights = [KEYWORD_WEIGHT] * len(self.keywords)
+        if len(keyword_weights) != len(self.keywords):
+            raise ValueError("keyword_weights must have one weight per keyword")
+
+        self.max_score = max_score
+        self.weights = np.array(
+            list(keyword_weights) + [careers_weight, social_weight, contact_weight],
+            dtype=np.float64
+        )
+        self.reasons = [f"Company is related to {keyword}" for keyword in self.keywords] + [
+            "Company has a careers page, indicating they invest in talent",
+            "Company has social media presence",
+            "Company has contact information available"
+        ]
+
+        self._columns = {keyword: column for column, keyword in enumerate(self.keywords)}
+        # Longest first, so a keyword never loses to one of its own prefixes
+        alternatives = sorted(self._columns, key=len, reverse=True)
+        self._pattern = re.compile(
+            r"\b(" + "|".join(re.escape(keyword) for keyword in alternatives) + r")s?\b",
+            re.IGNORECASE
+        )
+
+        self.feature_cache = get_feature_cache(self.keywords)
+
+        # Identifies the scoring rules, so stored scores from other rules are recomputed
+        rules = {"keywords": self.keywords, "weights": self.weights.tolist(), "max_score": max_score}
+        self.version = hashlib.sha256(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    def features(self, sponsors: Sequence[Dict]) -> np.ndarray:
+        """
+        Build the feature matrix of sponsors.
+
+        Returns:
+            Array of shape (len(sponsors), len(keywords) + 3) holding 0 or 1
+        """
+        keyword_count = len(self.keywords)
+        columns = self._columns
+        findall = self._pattern.findall
+        rows = []
+        cols = []
+
+        # Collect the set cells first and write them with one fancy-indexing
+        # assignment, which is much cheaper than element-wise writes
+        for row, sponsor in enumerate(sponsors):
+            hits = {columns[keyword.lower()] for keyword in findall(sponsor.get("description") or "")}
+
+            if sponsor.get("careers_page"):
+                hits.add(keyword_count)
+            if sponsor.get("social_media"):
+                hits.add(keyword_count + 1)
+            if sponsor.get("email") or sponsor.get("phone") or sponsor.get("contact_page"):
+                hits.add(keyword_count + 2)
+
+            rows.extend([row] * len(hits))
+            cols.extend(hits)
+
+        matrix = np.zeros((len(sponsors), keyword_count + 3), dtype=np.uint8)
+        matrix[rows, cols] = 1
+        return matrix
+
+    def cached_features(self, sponsors: Sequence[Dict], keys: Sequence[str]) -> np.ndarray:
+        """
+        Like features(), but reuses the cached rows of sponsors whose
+        fit_features_hash() is in keys.
+
+        Args:
+            sponsors: Sponsors to build the feature matrix of
+            keys: fit_features_hash() of each sponsor, in the same order
+        """
+        width = len(self.keywords) + 3
+        rows = self.feature_cache.get_many(keys)
+        missing = [index for index, row in enumerate(rows) if row is None]
+        if missing:
+            built = self.features([sponsors[index] for index in missing])
+            for index, row in zip(missing, built):
+                rows[index] = row.tobytes()
+            self.feature_cache.put_many([(keys[index], rows[index]) for index in missing])
+        return np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), width)
+
+    def scores(self, features: np.ndarray, weights: np.ndarray = None) -> np.ndarray:
+        """
+        Score a feature matrix built by features().
+
+        Args:
+            features: Feature matrix
+            weights: Weight vector overriding self.weights, e.g. to try new weights
+
+        Returns:
+            Array of capped scores, one per row
+        """
+        weights = self.weights if weights is None else np.asarray(weights, dtype=np.float64)
+        return np.minimum(features @ weights, self.max_score)
+
+    def analyze(self, sponsors: Sequence[Dict], features: np.ndarray = None) -> List[Dict]:
+        """
+        Score sponsors and explain their scores.
+
+        Args:
+            sponsors: Sponsors to score
+            features: Their feature matrix, built from sponsors if not given
+
+        Returns:
+            A {"score", "reasons"} dictionary per sponsor, in the same order
+        """
+        start = time.perf_counter()
+        if features is None:
+            features = self.features(sponsors)
+        scores = self.scores(features)
+        # Features whose weight is 0 don't contribute and aren't reported
+        contributing = features & (self.weights != 0)
+
+        # Sponsors share a handful of feature patterns, so the reasons are
+        # looked up once per distinct row
+        # looked up once per distinct row, each row packed into one integer
+        bits = np.left_shift(1, np.arange(contributing.shape[1], dtype=np.int64))
+        patterns, rows = np.unique(contributing @ bits, return_inverse=True)
+        pattern_reasons = [
+            [reason for column, reason in enumerate(self.reasons) if pattern >> column & 1]
+            for pattern in patterns.tolist()
+        ]
+
+        analyses = [
+            {"score": int(score) if score.is_integer() else score, "reasons": list(pattern_reasons[row])}
+            for score, row in zip(scores.tolist(), rows.reshape(-1).tolist())
+        ]
+        FIT_SCORING_SECONDS.observe(time.perf_counter() - start)
+        FIT_SCORED_SPONSORS.inc(len(analyses))
+        return analyses
+
+
+default_scorer = FitScorer()
+
+
+def fit_features_hash(sponsor: Dict) -> str:
+    """
+    Hash the FIT_FIELDS of a sponsor, which its feature row is built from.
+    """
+    fields = {field: sponsor.get(field) for field in FIT_FIELDS}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def fit_input_hash(sponsor: Dict, scorer: FitScorer = None, features_hash: str = None) -> str:
+    """
+    Hash everything a sponsor's fit score depends on: its FIT_FIELDS and the
+    version of the scoring rules.
+
+    Args:
+        sponsor: Sponsor to hash
+        scorer: Scorer whose rules apply, defaults to default_scorer
+        features_hash: fit_features_hash() of sponsor, if already known
+    """
+    scorer = scorer or default_scorer
+    features_hash = features_hash or fit_features_hash(sponsor)
+    return hashlib.sha256(f"{features_hash}:{scorer.version}".encode("utf-8")).hexdigest()
+
+
+def update_fit_scores(
+    collection,
+    query: Dict = None,
+    scorer: FitScorer = None,
+    batch_size: int = None,
+    force: bool = False
+) -> Dict:
+    """
+    Store fit scores on sponsor documents, recomputing only those whose
+    scoring inputs changed since they were last scored.
+
+    Each scored sponsor gets fit_score, which is indexed for ranking, the
+    full fit_analysis and the fit_hash of its inputs.
+
+    Args:
+        collection: Sponsors collection
+        query: Filter selecting the sponsors to check, defaults to all sponsors
+        scorer: Scorer to use, defaults to default_scorer
+        batch_size: Sponsors scored per bulk write, defaults to FIT_SCORE_BATCH_SIZE
+        force: Rescore sponsors even if their inputs are unchanged
+
+    Returns:
+        Dictionary with the number of scored and unchanged sponsors
+    """
+    # Imported here so scoring in the scraper doesn't load pymongo
+    from pymongo import UpdateOne
+
+    scorer = scorer or default_scorer
+    batch_size = batch_size or FIT_SCORE_BATCH_SIZE
+    projection = {field: 1 for field in FIT_FIELDS}
+    projection["fit_hash"] = 1
+
+    pending = []
+    scored = 0
+    unchanged = 0
+
+    def flush():
+        sponsors = [sponsor for sponsor, _, _ in pending]
+        features = scorer.cached_features(sponsors, [features_hash for _, features_hash, _ in pending])
+        analyses = scorer.analyze(sponsors, features)
+        operations = []
+        for (sponsor, _, input_hash), analysis in zip(pending, analyses):
+            operations.append(UpdateOne(
+                {"_id": sponsor["_id"]},
+                {"$set": {"fit_score": analysis["score"], "fit_analysis": analysis, "fit_hash": input_hash}}
+            ))
+        collection.bulk_write(operations, ordered=False)
+        pending.clear()
+
+    for sponsor in collection.find(query or {}, projection):
+        features_hash = fit_features_hash(sponsor)
+        input_hash = fit_input_hash(sponsor, scorer, features_hash)
+        if not force and sponsor.get("fit_hash") == input_hash:
+            unchanged += 1
+            continue
+
+        pending.append((sponsor, features_hash, input_hash))
+        scored += 1
+        if len(pending) >= batch_size:
+            flush()
+
+    if pending:
+        flush()
+
+    return {"scored": scored, "unchanged": unchanged}
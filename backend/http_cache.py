@@ -0,0 +1,313 @@
+import hashlib
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from dotenv import load_dotenv
+
+from connections import get_site_session
+
+load_dotenv()
+
+BACKEND_DIR = pathlib.Path(__file__).parent.absolute()
+
+# Cache settings. Entries younger than HTTP_CACHE_TTL seconds are served from
+# disk without touching the network, older ones are revalidated with the site.
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join(BACKEND_DIR, "data", "http_cache"))
+HTTP_CACHE_TTL = int(os.getenv("HTTP_CACHE_TTL", str(24 * 60 * 60)))
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# Streaming fetch limits. Reading stops after PAGE_BODY_BYTES of <body> (contact
+# links and emails are almost always near the top) or PAGE_MAX_BYTES in total.
+PAGE_MAX_BYTES = int(os.getenv("PAGE_MAX_BYTES", str(1024 * 1024)))
+PAGE_BODY_BYTES = int(os.getenv("PAGE_BODY_BYTES", str(64 * 1024)))
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+CHUNK_SIZE = 16 * 1024
+
+
+class NonHtmlContentError(requests.exceptions.RequestException):
+    """
+    Raised when a URL serves something other than an HTML page.
+    """
+
+
+class CachedPage:
+    """
+    A fetched page, either fresh from the network or read from the cache.
+    """
+
+    def __init__(self, url: str, content: bytes, encoding: Optional[str], from_cache: bool):
+        self.url = url
+        self.content = content
+        self.encoding = encoding
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class HttpCache:
+    """
+    Content-addressed on-disk HTTP response cache.
+
+    Response bodies are stored once per SHA-256 digest under blobs/, and a
+    SQLite index maps each URL to its blob plus the validators (ETag and
+    Last-Modified) needed for conditional revalidation. When the stored blobs
+    exceed max_bytes, the least recently used URLs are evicted.
+    """
+
+    def __init__(self, cache_dir: str = None, ttl: int = None, max_bytes: int = None):
+        """
+        Args:
+            cache_dir: Directory holding the index and blobs, defaults to HTTP_CACHE_DIR
+            ttl: Seconds an entry is served without revalidation, defaults to HTTP_CACHE_TTL
+            max_bytes: Size cap for stored bodies, defaults to HTTP_CACHE_MAX_BYTES
+        """
+        self.cache_dir = cache_dir or HTTP_CACHE_DIR
+        self.ttl = HTTP_CACHE_TTL if ttl is None else ttl
+        self.max_bytes = HTTP_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.blob_dir = os.path.join(self.cache_dir, "blobs")
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(self.cache_dir, "index.sqlite3"), check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                encoding TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        self._db.commit()
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest)
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Look up the cache entry for a URL.
+
+        Returns:
+            Dictionary with the entry's validators, body and freshness, or None
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest, encoding, etag, last_modified, fetched_at FROM entries WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            digest, encoding, etag, last_modified, fetched_at = row
+            try:
+                with open(self._blob_path(digest), "rb") as file:
+                    content = file.read()
+            except OSError:
+                # Blob went missing, drop the dangling entry
+                self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self._db.commit()
+                return None
+
+            self._db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+
+        return {
+            "content": content,
+            "encoding": encoding,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": time.time() - fetched_at < self.ttl
+        }
+
+    def put(self, url: str, content: bytes, encoding: Optional[str], etag: Optional[str], last_modified: Optional[str]) -> None:
+        """
+        Store a response body and its validators for a URL.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            tmp_path = f"{blob_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as file:
+                file.write(content)
+            os.replace(tmp_path, blob_path)
+
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT digest FROM entries WHERE url = ?", (url,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, digest, len(content), encoding, etag, last_modified, now, now)
+            )
+            if old and old[0] != digest:
+                self._remove_blob_if_unused(old[0])
+            self._evict()
+            self._db.commit()
+
+    def touch(self, url: str) -> None:
+        """
+        Mark an entry as freshly validated, e.g. after a 304 Not Modified.
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute("UPDATE entries SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, url))
+            self._db.commit()
+
+    def _remove_blob_if_unused(self, digest: str) -> None:
+        in_use = self._db.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+        if not in_use:
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError:
+                pass
+
+    def _total_bytes(self) -> int:
+        row = self._db.execute("SELECT SUM(size) FROM (SELECT DISTINCT digest, size FROM entries)").fetchone()
+        return row[0] or 0
+
+    def _evict(self) -> None:
+        """
+        Drop least recently used entries until the blobs fit under max_bytes.
+        """
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+
+        rows = self._db.execute("SELECT url, digest FROM entries ORDER BY last_access").fetchall()
+        for url, digest in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._remove_blob_if_unused(digest)
+            total = self._total_bytes()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> HttpCache:
+    """
+    Get the process-wide cache, creating it on first use.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HttpCache()
+        return _default_cache
+
+
+def looks_like_html(content: bytes) -> bool:
+    """
+    Sniff whether the start of a body without a Content-Type is HTML.
+    """
+    start = content[:1024].lstrip().lower()
+    return start.startswith((b"<!doctype html", b"<html", b"<head", b"<body", b"<!--", b"<meta"))
+
+
+def read_html(response: requests.Response, max_bytes: int, body_bytes: int) -> bytes:
+    """
+    Read a streamed HTML response in chunks, stopping once the head and the
+    first body_bytes of <body> have arrived or max_bytes have been read.
+    """
+    buffer = bytearray()
+    body_start = None
+
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        search_from = max(0, len(buffer) - 5)
+        buffer.extend(chunk)
+
+        if body_start is None:
+            position = buffer[search_from:].lower().find(b"<body")
+            if position != -1:
+                body_start = search_from + position
+        if body_start is not None and len(buffer) - body_start >= body_bytes:
+            return bytes(buffer[:body_start + body_bytes])
+        if len(buffer) >= max_bytes:
+            return bytes(buffer[:max_bytes])
+
+    return bytes(buffer)
+
+
+def fetch_page(
+    url: str,
+    headers: Dict = None,
+    timeout: float = 10,
+    cache: HttpCache = None,
+    max_bytes: int = None,
+    body_bytes: int = None,
+    session: requests.Session = None
+) -> CachedPage:
+    """
+    Fetch the top of an HTML page through the on-disk cache.
+
+    Fresh entries are served from disk. Stale entries are revalidated with
+    If-None-Match / If-Modified-Since and reused when the site answers 304.
+    Otherwise the body is streamed and reading stops early, see read_html.
+
+    Args:
+        url: Page URL
+        headers: Extra request headers
+        timeout: Request timeout in seconds
+        cache: Cache to use, defaults to the process-wide cache
+        max_bytes: Hard cap on bytes read, defaults to PAGE_MAX_BYTES
+        body_bytes: Bytes of <body> to read, defaults to PAGE_BODY_BYTES
+        session: Session to send the request with, defaults to the shared site session
+
+    Returns:
+        The fetched page
+
+    Raises:
+        NonHtmlContentError: If the URL serves a PDF, video or other non-HTML content
+        requests.exceptions.RequestException: If the request fails
+    """
+    cache = cache or get_default_cache()
+    max_bytes = max_bytes or PAGE_MAX_BYTES
+    body_bytes = body_bytes or PAGE_BODY_BYTES
+    request_headers = dict(headers or {})
+
+    entry = cache.get(url)
+    if entry is not None:
+        if entry["fresh"]:
+            return CachedPage(url, entry["content"], entry["encoding"], from_cache=True)
+        if entry["etag"]:
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+
+    session = session or get_site_session()
+    with session.get(url, headers=request_headers, timeout=timeout, stream=True) as response:
+        if response.status_code == 304 and entry is not None:
+            cache.touch(url)
+            return CachedPage(url, entry["content"], entry["encoding"], from_cache=True)
+
+        response.raise_for_status()
+
+        # Bail out before downloading anything that isn't a web page
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type and content_type not in HTML_CONTENT_TYPES:
+            raise NonHtmlContentError(f"Skipping {content_type} content at {url}")
+
+        content = read_html(response, max_bytes, body_bytes)
+        if not content_type and not looks_like_html(content):
+            raise NonHtmlContentError(f"Skipping non-HTML content at {url}")
+
+        encoding = response.encoding
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        cacheable = "no-store" not in response.headers.get("Cache-Control", "")
+
+    if cacheable:
+        cache.put(url, content, encoding, etag, last_modified)
+
+    return CachedPage(url, content, encoding, from_cache=False)
@@ -0,0 +1,57 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Runs in a fresh interpreter, like a newly started worker
+PROBE = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+flask_app = app.create_app()
+created = time.perf_counter()
+flask_app.test_client().get('/api/hello')
+served = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "first_request_ms": (served - created) * 1000,
+    "total_ms": (served - start) * 1000
+}))
+"""
+
+
+def measure(runs: int) -> dict:
+    """
+    Start the backend in runs fresh interpreters and report the median time
+    to import the app, create it and serve a first request.
+    """
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            cwd=BACKEND_DIR,
+            check=True,
+            capture_output=True,
+            text=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    return {
+        key: round(statistics.median(sample[key] for sample in samples), 1)
+        for key in samples[0]
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the cold start time of the backend.")
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreters to start")
+    args = parser.parse_args()
+
+    print(json.dumps(measure(args.runs), indent=2))
+    print("Run `python -X importtime -c 'import app'` for a per-module breakdown.")
@@ -0,0 +1,272 @@
+import heapq
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Latency buckets in seconds, from fast cache hits up to slow site fetches
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Number of slowest events kept per stage for /api/metrics/slow
+SLOW_EVENTS_PER_STAGE = int(os.getenv("SLOW_EVENTS_PER_STAGE", "20"))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric(ABC):
+    """
+    Base of the metric types. Values are kept per combination of label
+    values, so label values must come from a small, fixed set.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """
+        Get the metric's sample lines in the Prometheus text format.
+        """
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """
+    A count that only goes up.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}" for key, value in values]
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values, e.g. latencies in seconds, counted in
+    cumulative buckets.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Per label key: count per bucket (not cumulative), sum and count
+        self._values: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """
+        Observe the duration of the with block, also when it raises.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[2] if state else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+
+        lines = []
+        for key, (bucket_counts, total, count) in values:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class SlowEvents:
+    """
+    The slowest events seen per stage, e.g. the slowest sponsor sites, which
+    can't be metric labels without unbounded cardinality.
+    """
+
+    def __init__(self, capacity: int = None):
+        self.capacity = capacity or SLOW_EVENTS_PER_STAGE
+        self._heaps: Dict[str, List[Tuple[float, str]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, subject: str, seconds: float) -> None:
+        with self._lock:
+            heap = self._heaps.setdefault(stage, [])
+            if len(heap) < self.capacity:
+                heapq.heappush(heap, (seconds, subject))
+            elif seconds > heap[0][0]:
+                heapq.heapreplace(heap, (seconds, subject))
+
+    def snapshot(self) -> Dict[str, List[Dict]]:
+        """
+        Get the slowest events per stage, slowest first.
+        """
+        with self._lock:
+            return {
+                stage: [{"subject": subject, "seconds": round(seconds, 4)} for seconds, subject in sorted(heap, reverse=True)]
+                for stage, heap in self._heaps.items()
+            }
+
+
+class Registry:
+    """
+    Set of metrics rendered together in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+# Metrics of this process. Each worker process keeps its own values.
+REGISTRY = Registry()
+SLOW_EVENTS = SlowEvents()
+
+SERPER_SEARCH_SECONDS = REGISTRY.histogram(
+    "serper_search_seconds", "Serper searches by outcome (ok, cache_hit, error)", ["outcome"])
+SITE_FETCH_SECONDS = REGISTRY.histogram(
+    "site_fetch_seconds", "Sponsor page fetches by status (ok, cached, timeout, 4xx, 5xx, non_html, error)", ["status"])
+HTML_PARSE_SECONDS = REGISTRY.histogram(
+    "html_parse_seconds", "Parsing fetched pages for contact information")
+FIT_SCORING_SECONDS = REGISTRY.histogram(
+    "fit_scoring_seconds", "Fit scoring batches")
+FIT_SCORED_SPONSORS = REGISTRY.counter(
+    "fit_scored_sponsors_total", "Sponsors given a fit score")
+MONGO_COMMAND_SECONDS = REGISTRY.histogram(
+    "mongo_command_seconds", "MongoDB commands by kind (read, write, other), command and outcome",
+    ["kind", "command", "outcome"])
+TEMPLATE_RENDER_SECONDS = REGISTRY.histogram(
+    "template_render_seconds", "Template rendering calls by mode (batch, single)", ["mode"])
+TEMPLATES_RENDERED = REGISTRY.counter(
+    "templates_rendered_total", "Email templates rendered")
+TEMPLATES_SKIPPED = REGISTRY.counter(
+    "templates_skipped_total", "Email templates skipped because their inputs were unchanged")
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_seconds", "API requests by endpoint, method and status, until the response starts",
+    ["endpoint", "method", "status"])
+
+
+def mongo_command_listener():
+    """
+    Create a pymongo command listener recording every command's latency in
+    MONGO_COMMAND_SECONDS. Pass it to MongoClient(event_listeners=[...]).
+    """
+    from pymongo import monitoring
+
+    read_commands = {"find", "getMore", "aggregate", "count", "distinct", "listIndexes"}
+    write_commands = {"insert", "update", "delete", "findAndModify", "createIndexes"}
+
+    def kind(command_name: str) -> str:
+        if command_name in read_commands:
+            return "read"
+        if command_name in write_commands:
+            return "write"
+        return "other"
+
+    class CommandMetrics(monitoring.CommandListener):
+        def started(self, event):
+            pass
+
+        def succeeded(self, event):
+            MONGO_COMMAND_SECONDS.observe(
+                event.duration_micros / 1e6, kind=kind(event.command_name), command=event.command_name, outcome="ok")
+
+        def failed(self, event):
+            MONGO_COMMAND_SECONDS.observe(
+                event.duration_micros / 1e6, kind=kind(event.command_name), command=event.command_name, outcome="error")
+
+    return CommandMetrics()
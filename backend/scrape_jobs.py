@@ -0,0 +1,222 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterator, Optional
+
+from dotenv import load_dotenv
+
+from checkpoint import ScrapeCheckpoint, is_run_active, read_run
+
+load_dotenv()
+
+# Number of scrape runs allowed to execute at once, further jobs are queued
+SCRAPE_JOB_WORKERS = int(os.getenv("SCRAPE_JOB_WORKERS", "1"))
+
+# Seconds between run.json refreshes of unfinished jobs, well below
+# checkpoint.RUN_STALE_SECONDS
+SCRAPE_JOB_HEARTBEAT_SECONDS = 30
+
+FINISHED_STATUSES = ("completed", "failed", "interrupted")
+
+
+class ScrapeJob:
+    """
+    A scrape run executing in the background.
+
+    The job id is the run id of its checkpoint, and the job's progress is the
+    checkpoint's progress, so an interrupted job can be resumed by id.
+    """
+
+    def __init__(self, checkpoint: ScrapeCheckpoint):
+        self.checkpoint = checkpoint
+        self.job_id = checkpoint.run_id
+        self.status = "queued"
+        self.progress = dict(checkpoint.progress)
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow().isoformat()
+        self.finished_at: Optional[str] = None
+        self._version = 0
+        self._condition = threading.Condition()
+        checkpoint.on_progress = self._on_progress
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def _on_progress(self, progress: Dict) -> None:
+        with self._condition:
+            self.progress = progress
+            self._version += 1
+            self._condition.notify_all()
+
+    def _set_status(self, status: str, result: Dict = None, error: str = None) -> None:
+        with self._condition:
+            self.status = status
+            self.result = result
+            self.error = error
+            if self.finished:
+                self.finished_at = datetime.utcnow().isoformat()
+            self._version += 1
+            self._condition.notify_all()
+
+    def run(self, target: Callable[..., Dict], **kwargs) -> None:
+        """
+        Execute the scrape, called on a job worker thread.
+        """
+        self._set_status("running")
+        try:
+            result = target(self.checkpoint, **kwargs)
+        except Exception as e:
+            print(f"Scrape job {self.job_id} failed: {e}")
+            self.checkpoint.update(status="failed")
+            self._set_status("failed", error=str(e))
+        else:
+            self._set_status("completed", result=result)
+
+    def to_dict(self) -> Dict:
+        """
+        Get a JSON-serializable snapshot of the job.
+        """
+        with self._condition:
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "created_at": self.created_at,
+                "finished_at": self.finished_at,
+                "queries_total": self.progress.get("queries_total", 0),
+                "queries_done": self.progress.get("queries_done", 0),
+                "sites_fetched": self.progress.get("sites_fetched", 0),
+                "sponsors_found": self.progress.get("sponsors_found", 0),
+                "result": self.result,
+                "error": self.error
+            }
+
+    def updates(self, heartbeat: float = 15) -> Iterator[Optional[Dict]]:
+        """
+        Yield a snapshot whenever the job makes progress, until it finishes.
+
+        None is yielded when nothing happened for heartbeat seconds, so
+        streaming callers can keep their connection alive.
+        """
+        seen = -1
+        while True:
+            with self._condition:
+                if self._version == seen and not self.finished:
+                    self._condition.wait(heartbeat)
+                changed = self._version != seen
+                seen = self._version
+                finished = self.finished
+
+            yield self.to_dict() if changed else None
+            if finished:
+                return
+
+
+class ScrapeJobManager:
+    """
+    Runs scrape jobs on a small worker pool and keeps track of them by id.
+    """
+
+    def __init__(self, max_workers: int = None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or SCRAPE_JOB_WORKERS)
+        self._jobs: Dict[str, ScrapeJob] = {}
+        self._lock = threading.Lock()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+
+    def _heartbeat(self) -> None:
+        # Marks this process's unfinished jobs as alive for other workers
+        while True:
+            time.sleep(SCRAPE_JOB_HEARTBEAT_SECONDS)
+            with self._lock:
+                jobs = [job for job in self._jobs.values() if not job.finished]
+            for job in jobs:
+                try:
+                    job.checkpoint.heartbeat()
+                except OSError as e:
+                    print(f"Error refreshing scrape job {job.job_id}: {e}")
+
+    def start(self, checkpoint: ScrapeCheckpoint, target: Callable[..., Dict], **kwargs) -> ScrapeJob:
+        """
+        Queue a scrape for checkpoint's run. If that run already has an
+        unfinished job, that job is returned instead of starting another.
+
+        Args:
+            checkpoint: Checkpoint of a new run, or of an interrupted one to resume
+            target: Function called as target(checkpoint, **kwargs) that runs the scrape
+        """
+        with self._lock:
+            existing = self._jobs.get(checkpoint.run_id)
+            if existing is not None and not existing.finished:
+                return existing
+
+            job = ScrapeJob(checkpoint)
+            self._jobs[job.job_id] = job
+            if self._heartbeat_thread is None:
+                self._heartbeat_thread = threading.Thread(target=self._heartbeat, daemon=True)
+                self._heartbeat_thread.start()
+        # Recorded on disk right away, so other worker processes can report the job
+        checkpoint.update(status="queued")
+        self._executor.submit(job.run, target, **kwargs)
+        return job
+
+    def get(self, job_id: str) -> Optional[ScrapeJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+
+def recorded_job(job_id: str, runs_dir: str = None) -> Optional[Dict]:
+    """
+    Get a snapshot shaped like ScrapeJob.to_dict() of a job from its
+    checkpoint's run.json, for jobs started by another worker process.
+    Its result and error are only known to that process. Jobs whose process
+    stopped refreshing run.json are reported as interrupted.
+    """
+    progress = read_run(job_id, runs_dir)
+    if progress is None:
+        return None
+
+    status = progress.get("status", "running")
+    if status in ("queued", "running") and not is_run_active(progress):
+        status = "interrupted"
+    return {
+        "job_id": job_id,
+        "status": status,
+        "created_at": progress.get("started_at"),
+        "finished_at": progress.get("updated_at") if status in FINISHED_STATUSES else None,
+        "queries_total": progress.get("queries_total", 0),
+        "queries_done": progress.get("queries_done", 0),
+        "sites_fetched": progress.get("sites_fetched", 0),
+        "sponsors_found": progress.get("sponsors_found", 0),
+        "result": None,
+        "error": None
+    }
+
+
+def recorded_job_updates(job_id: str, interval: float = 1, heartbeat: float = 15) -> Iterator[Optional[Dict]]:
+    """
+    Like ScrapeJob.updates(), but polls the job's run.json every interval
+    seconds, for jobs started by another worker process. Ends with an
+    interrupted snapshot if that process dies.
+    """
+    last = None
+    last_yield = time.monotonic()
+    while True:
+        job = recorded_job(job_id)
+        if job is None:
+            return
+
+        now = time.monotonic()
+        if job != last:
+            last = job
+            last_yield = now
+            yield job
+        elif now - last_yield >= heartbeat:
+            last_yield = now
+            yield None
+
+        if job["status"] in FINISHED_STATUSES:
+            return
+        time.sleep(interval)
@@ -1,18 +1,20 @@
 import requests
 import json
 import os
-import time
+from functools import partial
 from dotenv import load_dotenv
+from search_stage import perform_search, run_searches
+from search_cache import get_search_cache
+from dedupe import SponsorIndex
 
 load_dotenv()
 
-# load env variables
-SCRAPER_API_KEY = os.getenv("SERPER_API_KEY")
-
-def search_potential_sponsors():
+def search_potential_sponsors(force_refresh=False):
     """
     Search for companies that might sponsor a Formula SAE electric racecar team.
     Returns a list of potential sponsors with relevant information.
+    
+    Set force_refresh to bypass cached search results and query Serper again.
     """
     # Search queries that might help find potential sponsors
     search_queries = [
@@ -26,12 +28,11 @@ def search_potential_sponsors():
         "companies that sponsor sustainable racing initiatives"
     ]
     
-    all_results = []
+    sponsor_index = SponsorIndex()
     
-    for query in search_queries:
-        print(f"Searching for: {query}")
-        results = perform_search(query)
-        
+    # Run every query concurrently under the shared Serper rate limit
+    search = partial(perform_search, force_refresh=force_refresh)
+    for query, results in run_searches(search_queries, search):
         if results and "organic" in results:
             for result in results["organic"]:
                 # Extract relevant information
@@ -42,34 +43,19 @@ def search_potential_sponsors():
                     "search_query": query
                 }
                 
-                # Only add if it's not already in our results
-                if not any(r["name"] == sponsor_info["name"] for r in all_results):
-                    all_results.append(sponsor_info)
-        
-        # Be nice to the API
-        time.sleep(1)
+                # Add new companies, merge entries for ones we already have
+                sponsor_index.add(sponsor_info)
+    
+    all_results = sponsor_index.sponsors
+    
+    stats = get_search_cache().stats()
+    print(f"Search cache: {stats['hits']} hits, {stats['misses']} misses")
     
     # Save results to a file
     save_results(all_results)
     
     return all_results
 
-def perform_search(search_term):
-    """
-    Perform a search using the Serper API.
-    """
-    url = "https://google.serper.dev/search"
-    payload = {"q": search_term}
-    headers = {"X-API-KEY": SCRAPER_API_KEY, "Content-Type": "application/json"}
-    
-    try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()  # Raise an exception for HTTP errors
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error performing search: {e}")
-        return None
-
 def save_results(results):
     """
     Save the results to a JSON file.
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BACKEND_DIR = pathlib.Path(__file__).parent.absolute()
+
+# Search results younger than SEARCH_CACHE_TTL seconds are reused instead of
+# spending Serper quota on the same query again
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", os.path.join(BACKEND_DIR, "data", "search_cache.sqlite3"))
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", str(7 * 24 * 60 * 60)))
+
+
+def cache_key(endpoint: str, payload: Dict) -> str:
+    """
+    Build the cache key for a search request from its endpoint and parameters.
+    """
+    canonical = json.dumps({"endpoint": endpoint, "payload": payload}, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """
+    Persistent TTL cache of search API responses, keyed by query text and
+    request parameters.
+    """
+
+    def __init__(self, path: str = None, ttl: int = None):
+        """
+        Args:
+            path: SQLite file holding the cache, defaults to SEARCH_CACHE_PATH
+            ttl: Seconds a cached result stays valid, defaults to SEARCH_CACHE_TTL
+        """
+        self.path = path or SEARCH_CACHE_PATH
+        self.ttl = SEARCH_CACHE_TTL if ttl is None else ttl
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                response TEXT NOT NULL,
+                stored_at REAL NOT NULL
+            )"""
+        )
+        self._db.commit()
+
+    def get(self, endpoint: str, payload: Dict) -> Optional[Dict]:
+        """
+        Get the cached response for a search, or None if missing or expired.
+        """
+        key = cache_key(endpoint, payload)
+        with self._lock:
+            row = self._db.execute("SELECT response, stored_at FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None or time.time() - row[1] >= self.ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, endpoint: str, payload: Dict, response: Dict) -> None:
+        """
+        Store the response for a search.
+        """
+        key = cache_key(endpoint, payload)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (key, payload.get("q", ""), json.dumps(response), time.time())
+            )
+            self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the hit and miss counters since the process started.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """
+    Get the process-wide search cache, creating it on first use.
+    """
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchCache()
+        return _search_cache
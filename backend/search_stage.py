@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from dotenv import load_dotenv
+
+from connections import get_serper_session
+from metrics import SERPER_SEARCH_SECONDS, SLOW_EVENTS
+from search_cache import get_search_cache
+
+load_dotenv()
+
+SERPER_API_KEY = os.getenv("SERPER_API_KEY")
+# Overridden to point the scrapers at a stand-in, see benchmark_scraper.py
+SERPER_SEARCH_URL = os.getenv("SERPER_SEARCH_URL", "https://google.serper.dev/search")
+
+# Serper quota settings. The bucket refills at SERPER_RATE_LIMIT requests per
+# second and allows bursts of up to SERPER_BURST requests.
+SERPER_RATE_LIMIT = float(os.getenv("SERPER_RATE_LIMIT", "5"))
+SERPER_BURST = int(os.getenv("SERPER_BURST", "5"))
+SEARCH_MAX_WORKERS = int(os.getenv("SEARCH_MAX_WORKERS", "8"))
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens the bucket can hold
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> None:
+        """
+        Block until the requested number of tokens is available and take them.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# One limiter per process so every scraper shares the same Serper quota
+serper_limiter = TokenBucket(SERPER_RATE_LIMIT, SERPER_BURST)
+
+
+def perform_search(search_term: str, force_refresh: bool = False) -> Optional[Dict]:
+    """
+    Perform a search using the Serper API.
+
+    Results are served from the search cache unless they are older than
+    SEARCH_CACHE_TTL or force_refresh is set. Only requests that reach Serper
+    wait for serper_limiter.
+
+    Returns:
+        Serper's results, or None if the search failed
+    """
+    url = SERPER_SEARCH_URL
+    payload = {"q": search_term}
+    headers = {"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"}
+
+    start = time.perf_counter()
+    search_cache = get_search_cache()
+    if not force_refresh:
+        cached = search_cache.get(url, payload)
+        if cached is not None:
+            SERPER_SEARCH_SECONDS.observe(time.perf_counter() - start, outcome="cache_hit")
+            return cached
+
+    # Timed from here, so waiting for the rate limiter isn't counted as Serper latency
+    serper_limiter.acquire()
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        response = get_serper_session().post(url, headers=headers, json=payload)
+        response.raise_for_status()  # Raise an exception for HTTP errors
+        results = response.json()
+        search_cache.put(url, payload, results)
+        outcome = "ok"
+        return results
+    except requests.exceptions.RequestException as e:
+        print(f"Error performing search: {e}")
+        return None
+    finally:
+        elapsed = time.perf_counter() - start
+        SERPER_SEARCH_SECONDS.observe(elapsed, outcome=outcome)
+        SLOW_EVENTS.record("serper_search", search_term, elapsed)
+
+
+def run_searches(
+    queries: List[str],
+    search_fn: Callable[[str], Optional[Dict]],
+    limiter: TokenBucket = None,
+    max_workers: int = None
+) -> List[Tuple[str, Optional[Dict]]]:
+    """
+    Run all search queries concurrently.
+
+    perform_search takes a serper_limiter token itself, right before calling
+    Serper, so cached results are returned without waiting for the limiter.
+    Pass limiter to rate-limit a search_fn that doesn't.
+
+    Args:
+        queries: Search queries to run
+        search_fn: Function performing a single search, e.g. perform_search
+        limiter: Rate limiter taken before every search_fn call, defaults to none
+        max_workers: Number of concurrent searches, defaults to SEARCH_MAX_WORKERS
+
+    Returns:
+        List of (query, results) tuples in the same order as the queries
+    """
+    if not queries:
+        return []
+
+    max_workers = max_workers or SEARCH_MAX_WORKERS
+
+    def limited_search(query: str) -> Optional[Dict]:
+        if limiter is not None:
+            limiter.acquire()
+        print(f"Searching for: {query}")
+        return search_fn(query)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+        results = list(executor.map(limited_search, queries))
+
+    return list(zip(queries, results))
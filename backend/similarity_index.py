@@ -0,0 +1,277 @@
+import hashlib
+import os
+import pathlib
+import re
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import scipy.sparse as sp
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BACKEND_DIR = pathlib.Path(__file__).parent.absolute()
+SIMILARITY_INDEX_PATH = os.getenv(
+    "SIMILARITY_INDEX_PATH",
+    os.path.join(BACKEND_DIR, "data", "similarity_index.npz")
+)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]{2,}")
+STOP_WORDS = frozenset("""
+    a an and are as at be by for from has have in is it its of on or our that the their this
+    to was we with you your about more all can will us not but who which
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens without stop words.
+    """
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def sponsor_text(sponsor: Dict) -> str:
+    """
+    Get the text a sponsor is indexed by: its description and the search
+    query that found it.
+    """
+    return f"{sponsor.get('description') or ''} {sponsor.get('search_query') or ''}"
+
+
+class SimilarityIndex:
+    """
+    TF-IDF index of sponsor texts for "sponsors like this one" queries.
+
+    Raw term counts are kept as a sparse matrix with one row per sponsor.
+    Updates only tokenize sponsors whose text changed; TF-IDF weights are
+    derived from the counts in one vectorized pass afterwards, so document
+    frequencies never go stale. Queries are a sparse matrix-vector product
+    against the L2-normalized rows, i.e. cosine similarity.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path: File the index is saved to and loaded from, defaults to SIMILARITY_INDEX_PATH
+        """
+        self.path = path or SIMILARITY_INDEX_PATH
+        self.names: List[str] = []
+        self.text_hashes: List[str] = []
+        self.vocabulary: Dict[str, int] = {}
+        self.counts = sp.csr_matrix((0, 0), dtype=np.float32)
+        self._positions: Dict[str, int] = {}
+        self._matrix: Optional[sp.csr_matrix] = None
+        # Modification time of the file the index was last loaded from or saved to
+        self._file_mtime: Optional[int] = None
+        self._lock = threading.Lock()
+
+        if os.path.exists(self.path):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._positions
+
+    def _current_file_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load(self) -> None:
+        self._file_mtime = self._current_file_mtime()
+        with np.load(self.path, allow_pickle=False) as data:
+            self.names = data["names"].tolist()
+            self.text_hashes = data["text_hashes"].tolist()
+            self.vocabulary = {term: column for column, term in enumerate(data["terms"].tolist())}
+            self.counts = sp.csr_matrix(
+                (data["data"], data["indices"], data["indptr"]),
+                shape=tuple(data["shape"])
+            )
+        self._positions = {name: row for row, name in enumerate(self.names)}
+        self._matrix = None
+
+    def reload_if_changed(self) -> bool:
+        """
+        Load the index again if another process saved a newer file.
+
+        Returns:
+            True if the index was reloaded
+        """
+        with self._lock:
+            mtime = self._current_file_mtime()
+            if mtime is None or mtime == self._file_mtime:
+                return False
+            self._load()
+            return True
+
+    def save(self) -> None:
+        """
+        Write the index to disk, replacing the previous file atomically.
+        Every save writes its own temporary file, so processes saving at
+        the same time don't write into each other's file.
+        """
+        with self._lock:
+            terms = sorted(self.vocabulary, key=self.vocabulary.get)
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.savez_compressed(
+                        f,
+                        names=np.array(self.names, dtype=str),
+                        text_hashes=np.array(self.text_hashes, dtype=str),
+                        terms=np.array(terms, dtype=str),
+                        data=self.counts.data,
+                        indices=self.counts.indices,
+                        indptr=self.counts.indptr,
+                        shape=np.array(self.counts.shape)
+                    )
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self._file_mtime = self._current_file_mtime()
+
+    def update(self, sponsors: Iterable[Dict]) -> Dict:
+        """
+        Add new sponsors and re-index sponsors whose text changed.
+
+        Args:
+            sponsors: Sponsor dictionaries with at least a name
+
+        Returns:
+            Dictionary with the number of added, updated and unchanged sponsors
+        """
+        new_rows = {}
+        unchanged = 0
+
+        with self._lock:
+            for sponsor in sponsors:
+                name = sponsor.get("name")
+                if not name:
+                    continue
+                text = sponsor_text(sponsor)
+                text_hash = hashlib.sha1(text.encode("utf-8")).hexdigest()
+                row = self._positions.get(name)
+                if row is not None and self.text_hashes[row] == text_hash:
+                    unchanged += 1
+                    continue
+                new_rows[name] = (text, text_hash)
+
+            if not new_rows:
+                return {"added": 0, "updated": 0, "unchanged": unchanged}
+
+            updated = sum(1 for name in new_rows if name in self._positions)
+
+            # Count the terms of changed sponsors only
+            rows, columns, values = [], [], []
+            for row, (text, _) in enumerate(new_rows.values()):
+                term_counts = {}
+                for token in tokenize(text):
+                    column = self.vocabulary.setdefault(token, len(self.vocabulary))
+                    term_counts[column] = term_counts.get(column, 0) + 1
+                rows.extend([row] * len(term_counts))
+                columns.extend(term_counts)
+                values.extend(term_counts.values())
+
+            added_counts = sp.csr_matrix(
+                (np.array(values, dtype=np.float32), (rows, columns)),
+                shape=(len(new_rows), len(self.vocabulary))
+            )
+
+            # Keep the unchanged rows and append the re-counted ones
+            kept = [row for row, name in enumerate(self.names) if name not in new_rows]
+            old_counts = self.counts[kept] if kept else sp.csr_matrix((0, 0), dtype=np.float32)
+            old_counts.resize((len(kept), len(self.vocabulary)))
+
+            self.counts = sp.vstack([old_counts, added_counts], format="csr")
+            self.names = [self.names[row] for row in kept] + list(new_rows)
+            self.text_hashes = [self.text_hashes[row] for row in kept] + [
+                text_hash for _, text_hash in new_rows.values()
+            ]
+            self._positions = {name: row for row, name in enumerate(self.names)}
+            self._matrix = None
+
+        return {"added": len(new_rows) - updated, "updated": updated, "unchanged": unchanged}
+
+    def _tfidf(self) -> sp.csr_matrix:
+        """
+        Get the L2-normalized TF-IDF matrix, computing it after updates.
+        """
+        if self._matrix is None:
+            documents, terms = self.counts.shape
+            document_frequency = np.bincount(self.counts.indices, minlength=terms)
+            idf = np.log((1 + documents) / (1 + document_frequency)) + 1
+
+            matrix = self.counts.copy()
+            matrix.data = 1 + np.log(matrix.data)
+            matrix = sp.csr_matrix(matrix.multiply(idf.astype(np.float32)))
+
+            norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            self._matrix = sp.csr_matrix(sp.diags(1 / norms) @ matrix, dtype=np.float32)
+        return self._matrix
+
+    def similar(self, names: List[str], top_k: int = 10, exclude_seeds: bool = True) -> List[Dict]:
+        """
+        Find the sponsors most similar to a set of seed sponsors.
+
+        The seeds' TF-IDF rows are averaged into one query vector and every
+        indexed sponsor is ranked by cosine similarity to it.
+
+        Args:
+            names: Names of the seed sponsors, names not in the index are ignored
+            top_k: Number of sponsors to return
+            exclude_seeds: Leave the seeds themselves out of the results
+
+        Returns:
+            List of {"name", "score"} dictionaries, most similar first, or an
+            empty list if none of the seeds is indexed
+        """
+        with self._lock:
+            seed_rows = [self._positions[name] for name in names if name in self._positions]
+            if not seed_rows:
+                return []
+
+            matrix = self._tfidf()
+            query = np.asarray(matrix[seed_rows].mean(axis=0)).ravel()
+            query /= np.linalg.norm(query) or 1
+            scores = matrix @ query
+            if exclude_seeds:
+                scores[seed_rows] = -1
+
+            top_k = max(0, min(top_k, len(scores)))
+            if top_k == 0:
+                return []
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            return [
+                {"name": self.names[row], "score": round(float(scores[row]), 4)}
+                for row in top
+                if scores[row] > 0
+            ]
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """
+    Get the process-wide similarity index, loading it from disk on first use
+    and again whenever a scrape in another worker process saved a new one.
+    """
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = SimilarityIndex()
+        else:
+            _default_index.reload_if_changed()
+        return _default_index
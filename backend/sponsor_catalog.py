@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Seconds a cached catalog is served without checking its version. 0 checks
+# the version document on every read, which costs one indexed lookup.
+SPONSOR_CATALOG_CHECK_INTERVAL = float(os.getenv("SPONSOR_CATALOG_CHECK_INTERVAL", "0"))
+
+CATALOG_VERSION_ID = "sponsors_catalog"
+
+
+class SponsorCatalog:
+    """
+    Process-local cache of all sponsor records.
+
+    Writers bump a version counter document in the meta collection via
+    mark_changed(). Readers compare it with the version of their cached copy
+    and only reload the catalog when it changed, so an unchanged catalog is
+    never transferred twice.
+    """
+
+    def __init__(self, sponsors_collection, meta_collection, check_interval: float = None):
+        """
+        Args:
+            sponsors_collection: Collection holding the sponsors
+            meta_collection: Collection holding the version counter document
+            check_interval: Seconds between version checks, defaults to SPONSOR_CATALOG_CHECK_INTERVAL
+        """
+        self.sponsors_collection = sponsors_collection
+        self.meta_collection = meta_collection
+        self.check_interval = SPONSOR_CATALOG_CHECK_INTERVAL if check_interval is None else check_interval
+
+        self._lock = threading.Lock()
+        self._sponsors: Optional[List[Dict]] = None
+        self._version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.unchecked_hits = 0
+
+    def _current_version(self) -> int:
+        document = self.meta_collection.find_one({"_id": CATALOG_VERSION_ID}, {"version": 1})
+        return document["version"] if document else 0
+
+    def get(self) -> List[Dict]:
+        """
+        Get all sponsors, reloading them only if the catalog changed.
+
+        The returned records are shared with the cache and must not be modified.
+        """
+        with self._lock:
+            now = time.time()
+            if self._sponsors is not None and now - self._checked_at < self.check_interval:
+                self.hits += 1
+                self.unchecked_hits += 1
+                return list(self._sponsors)
+
+            version = self._current_version()
+            self._checked_at = now
+            if self._sponsors is not None and version == self._version:
+                self.hits += 1
+                return list(self._sponsors)
+
+            self.misses += 1
+            self._sponsors = list(self.sponsors_collection.find({}, {"_id": 0}))
+            self._version = version
+            self._loaded_at = now
+            return list(self._sponsors)
+
+    def invalidate(self) -> None:
+        """
+        Drop the cached catalog in this process.
+        """
+        with self._lock:
+            self._sponsors = None
+            self._version = None
+
+    def mark_changed(self) -> None:
+        """
+        Record that the sponsors collection was written, invalidating the
+        cached catalog in every process.
+        """
+        self.meta_collection.update_one(
+            {"_id": CATALOG_VERSION_ID},
+            {"$inc": {"version": 1}},
+            upsert=True
+        )
+        self.invalidate()
+
+    def stats(self) -> Dict:
+        """
+        Get hit and staleness metrics of the cache.
+        """
+        with self._lock:
+            now = time.time()
+            cached = self._sponsors is not None
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "unchecked_hits": self.unchecked_hits,
+                "cached_sponsors": len(self._sponsors) if cached else 0,
+                "version": self._version,
+                "age_seconds": now - self._loaded_at if cached else None,
+                "seconds_since_version_check": now - self._checked_at if cached else None
+            }
+
+
+_default_catalog = None
+_default_catalog_lock = threading.Lock()
+
+
+def get_sponsor_catalog() -> SponsorCatalog:
+    """
+    Get the process-wide catalog of the shared database's sponsors, creating
+    it on first use.
+    """
+    global _default_catalog
+    with _default_catalog_lock:
+        if _default_catalog is None:
+            from connections import get_database
+
+            db = get_database()
+            _default_catalog = SponsorCatalog(db["sponsors"], db["meta"])
+        return _default_catalog
@@ -1,27 +1,132 @@
+import argparse
 import requests
 import json
 import os
-import time
+from functools import partial
 import re
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+import time
+import lxml.html
+from lxml import etree
+from urllib.parse import urldefrag, urljoin, urlparse
 from dotenv import load_dotenv
 import pathlib
+from search_stage import perform_search, run_searches
+from search_cache import get_search_cache
+from dedupe import SHARED_DOMAINS, SponsorIndex, registrable_domain
+from fetch_pool import FetchPool
+from http_cache import NonHtmlContentError, fetch_page
+from checkpoint import ScrapeCheckpoint
+from fit_scoring import default_scorer
+from metrics import HTML_PARSE_SECONDS, SITE_FETCH_SECONDS, SLOW_EVENTS
+
+load_dotenv()
 
 # Get the absolute path to the backend directory
 BACKEND_DIR = pathlib.Path(__file__).parent.absolute()
-DATA_DIR = os.path.join(BACKEND_DIR, "data")
+# Where scrape results are saved, overridden by benchmark_scraper.py
+DATA_DIR = os.getenv("SCRAPER_DATA_DIR", os.path.join(BACKEND_DIR, "data"))
 
-load_dotenv()
-
-# Load environment variables
-SCRAPER_API_KEY = os.getenv("SERPER_API_KEY")
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
-def search_potential_sponsors():
+# Crawl limits for the contact, about and careers pages found on homepages
+CRAWL_MAX_DEPTH = int(os.getenv("CRAWL_MAX_DEPTH", "1"))
+CRAWL_PAGES_PER_DOMAIN = int(os.getenv("CRAWL_PAGES_PER_DOMAIN", "4"))
+FOLLOWED_PAGES = ("contact_page", "about_page", "careers_page")
+
+# Anchor text that marks contact, about and careers links. Each group is named
+# after the contact_info field it fills.
+LINK_PATTERN = re.compile(
+    r'(?P<contact_page>contact|reach|get in touch)'
+    r'|(?P<about_page>about|our story)'
+    r'|(?P<careers_page>careers|jobs|join us|work with us)',
+    re.I
+)
+
+# Emails, social media links and phone numbers, matched in one scan of the page
+CONTACT_PATTERN = re.compile(
+    r'(?P<email>[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
+    r'|(?P<social>https?://(?:www\.)?(?:'
+    r'facebook\.com/[a-zA-Z0-9.]+'
+    r'|twitter\.com/[a-zA-Z0-9.]+'
+    r'|linkedin\.com/(?:company|in)/[a-zA-Z0-9-]+'
+    r'|instagram\.com/[a-zA-Z0-9.]+))'
+    r'|(?P<phone>(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})'
+)
+
+class CrawlFrontier:
+    """
+    Decides which discovered pages of a sponsor's site get crawled.
+    
+    Every sponsor's homepage is fetched. Pages linked from it are only
+    followed on the sponsor's own registrable domain, up to max_depth links
+    away from the homepage and pages_per_domain followed pages per domain.
+    Sponsors on SHARED_DOMAINS such as reddit.com are separate sponsors, so
+    each of them gets a budget of its own. Followed pages are crawled at most
+    once.
+    """
+    
+    def __init__(self, max_depth=None, pages_per_domain=None):
+        self.max_depth = CRAWL_MAX_DEPTH if max_depth is None else max_depth
+        self.pages_per_domain = CRAWL_PAGES_PER_DOMAIN if pages_per_domain is None else pages_per_domain
+        self.visited = set()
+        self._pages_crawled = {}
+    
+    def schedule(self, url, depth, website):
+        """
+        Mark url as visited if it should be crawled.
+        
+        Args:
+            url: Page URL
+            depth: Number of links between the sponsor's homepage and the page
+            website: The sponsor's homepage
+        
+        Returns:
+            True if the page should be fetched
+        """
+        url = urldefrag(url)[0]
+        if depth == 0:
+            self.visited.add(url)
+            return True
+        
+        if depth > self.max_depth or url in self.visited:
+            return False
+        
+        domain = registrable_domain(url)
+        if not domain or domain != registrable_domain(website):
+            return False
+        budget_key = urldefrag(website)[0] if domain in SHARED_DOMAINS else domain
+        if self._pages_crawled.get(budget_key, 0) >= self.pages_per_domain:
+            return False
+        
+        self.visited.add(url)
+        self._pages_crawled[budget_key] = self._pages_crawled.get(budget_key, 0) + 1
+        return True
+
+def merge_contact_info(sponsor_info, contact_info):
+    """
+    Merge contact information from one of a sponsor's pages into its record.
+    
+    Fields the record already has are kept, and emails, phone numbers and
+    social media links are added to the lists of everything found so far.
+    """
+    for key, value in contact_info.items():
+        if isinstance(value, list):
+            merged = sponsor_info.setdefault(key, [])
+            merged.extend(item for item in value if item not in merged)
+        elif value and not sponsor_info.get(key):
+            sponsor_info[key] = value
+        else:
+            sponsor_info.setdefault(key, value)
+
+def search_potential_sponsors(force_refresh=False, checkpoint=None):
     """
     Search for companies that might sponsor a Formula SAE electric racecar team.
     Returns a list of potential sponsors with relevant information.
+    
+    Set force_refresh to bypass cached search results and query Serper again.
+    Progress is recorded in checkpoint, a new run is started if none is given.
+    Pass the checkpoint of an interrupted run to skip its finished searches
+    and fetches.
     """
     # Search queries that might help find potential sponsors
     search_queries = [
@@ -37,12 +142,21 @@ def search_potential_sponsors():
         "companies that sponsor student engineering projects"
     ]
     
-    all_results = []
+    if checkpoint is None:
+        checkpoint = ScrapeCheckpoint()
+    checkpoint.start(len(search_queries))
+    print(f"Scrape run: {checkpoint.run_id}")
+    
+    # Run every query the checkpoint doesn't have yet concurrently under the
+    # shared Serper rate limit
+    pending_queries = [q for q in search_queries if q not in checkpoint.completed_queries]
+    search = checkpoint.recording_search(partial(perform_search, force_refresh=force_refresh))
+    searched = dict(run_searches(pending_queries, search))
+    
+    sponsor_index = SponsorIndex()
     
     for query in search_queries:
-        print(f"Searching for: {query}")
-        results = perform_search(query)
-        
+        results = checkpoint.completed_queries.get(query) or searched.get(query)
         if results and "organic" in results:
             for result in results["organic"]:
                 # Extract relevant information
@@ -53,41 +167,61 @@ def search_potential_sponsors():
                     "search_query": query
                 }
                 
-                # Only add if it's not already in our results
-                if not any(r["name"] == sponsor_info["name"] for r in all_results):
-                    # Try to extract contact information from the website
-                    if sponsor_info["website"]:
-                        try:
-                            contact_info = extract_contact_info(sponsor_info["website"])
-                            sponsor_info.update(contact_info)
-                        except Exception as e:
-                            print(f"Error extracting contact info from {sponsor_info['website']}: {e}")
-                    
-                    all_results.append(sponsor_info)
+                # Add new companies, merge entries for ones we already have
+                sponsor_index.add(sponsor_info)
+    
+    all_results = sponsor_index.sponsors
+    
+    # Try to extract contact information from every website concurrently,
+    # merging each result back into its sponsor as soon as it arrives. The
+    # contact, about and careers pages found along the way are crawled through
+    # the same pool, so they share its per-host politeness limits. Pages
+    # fetched before an interruption are replayed from the checkpoint.
+    checkpoint.update(sponsors_found=len(all_results))
+    fetch = checkpoint.recording_fetch(extract_contact_info)
+    frontier = CrawlFrontier()
+    with FetchPool() as pool:
+        for sponsor_info in all_results:
+            website = sponsor_info["website"]
+            if website and frontier.schedule(website, 0, website):
+                pool.submit(website, fetch, tag=(sponsor_info, 0))
         
-        # Be nice to the API
-        time.sleep(1)
+        for (sponsor_info, depth), contact_info, error in pool.results():
+            if error:
+                print(f"Error extracting contact info from {sponsor_info['website']}: {error}")
+                continue
+            if not contact_info:
+                continue
+            
+            merge_contact_info(sponsor_info, contact_info)
+            
+            for page in FOLLOWED_PAGES:
+                link = contact_info.get(page)
+                if link and frontier.schedule(link, depth + 1, sponsor_info["website"]):
+                    pool.submit(link, fetch, tag=(sponsor_info, depth + 1))
+    
+    stats = get_search_cache().stats()
+    print(f"Search cache: {stats['hits']} hits, {stats['misses']} misses")
     
     # Save results to a file
     save_results(all_results)
+    checkpoint.finish(len(all_results))
     
     return all_results
 
-def perform_search(search_term):
+def fetch_status(error):
     """
-    Perform a search using the Serper API.
+    Classify a failed page fetch for the site_fetch_seconds status label.
     """
-    url = "https://google.serper.dev/search"
-    payload = {"q": search_term}
-    headers = {"X-API-KEY": SCRAPER_API_KEY, "Content-Type": "application/json"}
-    
-    try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()  # Raise an exception for HTTP errors
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error performing search: {e}")
-        return None
+    if isinstance(error, requests.exceptions.Timeout):
+        return "timeout"
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return f"{error.response.status_code // 100}xx"
+    if isinstance(error, NonHtmlContentError):
+        return "non_html"
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return "connection_error"
+    return "error"
 
 def extract_contact_info(url):
     """
@@ -95,84 +229,101 @@ def extract_contact_info(url):
     """
     headers = {"User-Agent": USER_AGENT}
     
+    start = time.perf_counter()
+    status = "error"
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Initialize contact info dictionary
-        contact_info = {
-            "email": None,
-            "phone": None,
-            "contact_page": None,
-            "about_page": None,
-            "careers_page": None,
-            "social_media": []
-        }
-        
-        # Find contact page link
-        contact_links = soup.find_all('a', href=True, text=re.compile(r'contact|reach|get in touch', re.I))
-        if contact_links:
-            contact_link = contact_links[0]['href']
-            if not contact_link.startswith('http'):
-                # Handle relative URLs
-                parsed_url = urlparse(url)
-                base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-                contact_link = base_url + ('' if contact_link.startswith('/') else '/') + contact_link
-            contact_info["contact_page"] = contact_link
-        
-        # Find about page link
-        about_links = soup.find_all('a', href=True, text=re.compile(r'about|about us|our story', re.I))
-        if about_links:
-            about_link = about_links[0]['href']
-            if not about_link.startswith('http'):
-                parsed_url = urlparse(url)
-                base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-                about_link = base_url + ('' if about_link.startswith('/') else '/') + about_link
-            contact_info["about_page"] = about_link
-        
-        # Find careers page link
-        careers_links = soup.find_all('a', href=True, text=re.compile(r'careers|jobs|join us|work with us', re.I))
-        if careers_links:
-            careers_link = careers_links[0]['href']
-            if not careers_link.startswith('http'):
-                parsed_url = urlparse(url)
-                base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-                careers_link = base_url + ('' if careers_link.startswith('/') else '/') + careers_link
-            contact_info["careers_page"] = careers_link
-        
-        # Find email addresses
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        emails = re.findall(email_pattern, response.text)
-        if emails:
-            contact_info["email"] = emails[0]  # Just take the first email
-        
-        # Find phone numbers
-        phone_pattern = r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phones = re.findall(phone_pattern, response.text)
-        if phones:
-            contact_info["phone"] = phones[0]  # Just take the first phone number
-        
-        # Find social media links
-        social_patterns = [
-            r'https?://(?:www\.)?facebook\.com/[a-zA-Z0-9.]+',
-            r'https?://(?:www\.)?twitter\.com/[a-zA-Z0-9.]+',
-            r'https?://(?:www\.)?linkedin\.com/(?:company|in)/[a-zA-Z0-9-]+',
-            r'https?://(?:www\.)?instagram\.com/[a-zA-Z0-9.]+'
-        ]
-        
-        for pattern in social_patterns:
-            social_links = re.findall(pattern, response.text)
-            if social_links:
-                contact_info["social_media"].extend(social_links)
-        
-        return contact_info
+        # Served from the on-disk cache when the page is fresh or unchanged
+        response = fetch_page(url, headers=headers, timeout=10)
+        status = "cached" if response.from_cache else "ok"
+    except Exception as e:
+        status = fetch_status(e)
+        print(f"Error extracting contact info: {e}")
+        return {}
+    finally:
+        elapsed = time.perf_counter() - start
+        SITE_FETCH_SECONDS.observe(elapsed, status=status)
+        SLOW_EVENTS.record("site_fetch", url, elapsed)
     
+    try:
+        with HTML_PARSE_SECONDS.time():
+            return parse_contact_info(url, response.text)
     except Exception as e:
         print(f"Error extracting contact info: {e}")
         return {}
 
+def parse_html(html):
+    """
+    Parse an HTML document with lxml. Returns None for empty documents.
+    """
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # Documents with an XML encoding declaration must be parsed from bytes
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+    except etree.ParserError:
+        return None
+
+def parse_contact_info(url, html):
+    """
+    Extract contact information from a page's HTML in a single pass.
+    
+    The document is parsed once and every anchor is classified against
+    LINK_PATTERN, then the raw HTML is scanned once with CONTACT_PATTERN for
+    emails, phone numbers and social media links. All distinct emails and
+    phone numbers are listed, the first of each is the primary contact.
+    """
+    # Initialize contact info dictionary
+    contact_info = {
+        "email": None,
+        "phone": None,
+        "contact_page": None,
+        "about_page": None,
+        "careers_page": None,
+        "emails": [],
+        "phones": [],
+        "social_media": []
+    }
+    
+    # Record the first contact, about and careers link on the page
+    document = parse_html(html)
+    if document is not None:
+        for anchor in document.iter("a"):
+            href = anchor.get("href")
+            if not href:
+                continue
+            
+            pages = {match.lastgroup for match in LINK_PATTERN.finditer(anchor.text_content())}
+            pages = [page for page in pages if contact_info[page] is None]
+            if not pages:
+                continue
+            
+            # Resolve relative links against the page URL
+            link = urljoin(url, href.strip())
+            if urlparse(link).scheme not in ("http", "https"):
+                continue
+            for page in pages:
+                contact_info[page] = link
+            
+            if contact_info["contact_page"] and contact_info["about_page"] and contact_info["careers_page"]:
+                break
+    
+    # Find email addresses, phone numbers and social media links
+    found = {"email": {}, "phone": {}, "social": {}}
+    for match in CONTACT_PATTERN.finditer(html):
+        found[match.lastgroup].setdefault(match.group(), None)
+    
+    contact_info["emails"] = list(found["email"])
+    contact_info["phones"] = list(found["phone"])
+    contact_info["social_media"] = list(found["social"])
+    
+    # Keep the first email and phone number as the primary contact
+    if contact_info["emails"]:
+        contact_info["email"] = contact_info["emails"][0]
+    if contact_info["phones"]:
+        contact_info["phone"] = contact_info["phones"][0]
+    
+    return contact_info
+
 def save_results(results):
     """
     Save the results to a JSON file.
@@ -191,51 +342,24 @@ def analyze_sponsor_fit(sponsor):
     """
     Analyze how well a potential sponsor might fit with a Formula SAE electric team.
     Returns a score from 0-100 and reasons.
+    
+    Use default_scorer.analyze() to score many sponsors at once.
     """
-    score = 0
-    reasons = []
-    
-    # Check if the company is in the automotive or engineering sector
-    keywords = ["automotive", "engineering", "racing", "electric", "vehicle", "battery", 
-                "technology", "innovation", "sustainable", "green", "energy"]
-    
-    description = sponsor.get("description", "").lower()
-    for keyword in keywords:
-        if keyword in description:
-            score += 5
-            reasons.append(f"Company is related to {keyword}")
-    
-    # Check if they have a careers page (might be more open to partnerships)
-    if sponsor.get("careers_page"):
-        score += 10
-        reasons.append("Company has a careers page, indicating they invest in talent")
-    
-    # Check if they have social media presence
-    if sponsor.get("social_media"):
-        score += 5
-        reasons.append("Company has social media presence")
-    
-    # Check if they have contact information
-    if sponsor.get("email") or sponsor.get("phone") or sponsor.get("contact_page"):
-        score += 10
-        reasons.append("Company has contact information available")
-    
-    # Cap the score at 100
-    score = min(score, 100)
-    
-    return {
-        "score": score,
-        "reasons": reasons
-    }
+    return default_scorer.analyze([sponsor])[0]
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search for and analyze potential sponsors.")
+    parser.add_argument("--resume", metavar="RUN_ID", help="resume an interrupted scrape run")
+    parser.add_argument("--refresh", action="store_true", help="ignore cached search results")
+    args = parser.parse_args()
+    
     # Run the scraper function if this script is executed directly
-    potential_sponsors = search_potential_sponsors()
+    checkpoint = ScrapeCheckpoint.load(args.resume) if args.resume else None
+    potential_sponsors = search_potential_sponsors(force_refresh=args.refresh, checkpoint=checkpoint)
     print(f"Found {len(potential_sponsors)} potential sponsors")
     
-    # Analyze each sponsor
-    for sponsor in potential_sponsors:
-        analysis = analyze_sponsor_fit(sponsor)
+    # Analyze all sponsors in one batch
+    for sponsor, analysis in zip(potential_sponsors, default_scorer.analyze(potential_sponsors)):
         sponsor["fit_analysis"] = analysis
     
     # Sort sponsors by fit score
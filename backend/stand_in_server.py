@@ -0,0 +1,299 @@
+import argparse
+import json
+import os
+import pathlib
+import random
+import selectors
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = pathlib.Path(__file__).parent.absolute()
+SEED_PATH = os.path.join(BACKEND_DIR.parent, "data", "potential_sponsors.json")
+
+FILLER_WORDS = (
+    "automotive engineering racing electric vehicle battery technology innovation sustainable "
+    "energy partner students team performance design manufacturing precision components "
+    "software motorsport solutions quality customers global industry research"
+).split()
+
+
+# Pages every synthetic site serves
+SITE_PATHS = ("/", "/contact", "/about", "/careers")
+
+
+def site_address(index: int) -> str:
+    """
+    Get the loopback address of the index-th synthetic site. Every site gets
+    its own host, so per-host fetch limits and domain dedupe behave as they
+    do against real websites.
+    """
+    return f"127.1.{index // 254}.{index % 254 + 1}"
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    """
+    Local stand-in for the Serper API and for sponsor websites.
+
+    POST /search on the main address replays search results seeded from
+    data/potential_sponsors.json, padded with synthetic results up to
+    results_per_query. Each result links to a synthetic homepage served on
+    its own loopback address, with contact, about and careers pages behind
+    it. Page sizes and response latencies follow log-normal distributions
+    around the configured medians.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        results_per_query: int = 10,
+        page_kb: float = 60,
+        page_sigma: float = 0.5,
+        latency_ms: float = 50,
+        latency_sigma: float = 0.5,
+        serper_latency_ms: float = 300,
+        seed: int = 1,
+        seed_path: str = None
+    ):
+        """
+        Args:
+            results_per_query: Organic results returned per search query
+            page_kb: Median homepage size in KB
+            page_sigma: Log-normal sigma of homepage sizes
+            latency_ms: Median site response latency in milliseconds
+            latency_sigma: Log-normal sigma of site response latencies
+            serper_latency_ms: Latency of every search response in milliseconds
+            seed: Random seed, the same seed always produces the same sites
+            seed_path: Recorded sponsors to seed the search results from, defaults to SEED_PATH
+        """
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.page_kb = page_kb
+        self.page_sigma = page_sigma
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.serper_latency_ms = serper_latency_ms
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._pages: Dict[Tuple[int, str], bytes] = {}
+        self._pages_lock = threading.Lock()
+        self._stopped = threading.Event()
+
+        with open(seed_path or SEED_PATH, encoding="utf-8") as f:
+            seeds = json.load(f)
+
+        # Search results per query, each linking to a site of its own
+        self.results: Dict[str, List[Dict]] = {}
+        seeds_by_query: Dict[str, List[Dict]] = {}
+        for sponsor in seeds:
+            seeds_by_query.setdefault(sponsor.get("search_query", ""), []).append(sponsor)
+
+        self.site_sockets: List[socket.socket] = []
+        self.sites_by_address: Dict[Tuple[str, int], int] = {}
+        for query, query_seeds in seeds_by_query.items():
+            organic = []
+            for position in range(results_per_query):
+                site = len(self.site_sockets)
+                url = self._open_site(site)
+                if position < len(query_seeds):
+                    title = query_seeds[position].get("name") or f"Sponsor {site}"
+                    snippet = query_seeds[position].get("description") or ""
+                else:
+                    title = f"Synthetic Sponsor {site}"
+                    snippet = " ".join(self._random.choices(FILLER_WORDS, k=25))
+                organic.append({"title": title, "link": url, "snippet": snippet, "position": position + 1})
+            self.results[query] = organic
+
+        # Generate every page up front so response times only reflect the
+        # configured latency
+        for site in range(self.site_count):
+            for path in SITE_PATHS:
+                self.page(site, path)
+
+    @property
+    def serper_url(self) -> str:
+        host, port = self.server_address
+        return f"http://{host}:{port}/search"
+
+    @property
+    def site_count(self) -> int:
+        return len(self.site_sockets)
+
+    def _open_site(self, site: int) -> str:
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((site_address(site), 0))
+        listener.listen(128)
+        listener.setblocking(False)
+        self.site_sockets.append(listener)
+        address = listener.getsockname()
+        self.sites_by_address[address] = site
+        return f"http://{address[0]}:{address[1]}/"
+
+    def sample_latency(self, median_ms: float, sigma: float) -> float:
+        """
+        Draw a latency in seconds from a log-normal distribution.
+        """
+        if median_ms <= 0:
+            return 0
+        with self._random_lock:
+            return self._random.lognormvariate(0, sigma) * median_ms / 1000 if sigma else median_ms / 1000
+
+    def page(self, site: int, path: str) -> bytes:
+        """
+        Get the synthetic page at path of a site, generated once per site.
+        """
+        key = (site, path)
+        with self._pages_lock:
+            if key in self._pages:
+                return self._pages[key]
+
+        # Seeded per site, so a site's pages don't depend on request order
+        page_random = random.Random(f"{self.seed}-{site}-{path}")
+        target_bytes = int(page_random.lognormvariate(0, self.page_sigma) * self.page_kb * 1024)
+        if path != "/":
+            target_bytes //= 4
+
+        head = (
+            f"<!DOCTYPE html><html><head><title>Synthetic Sponsor {site}</title>"
+            f'<meta charset="utf-8"></head><body>'
+            f'<nav><a href="/contact">Contact us</a> <a href="/about">About us</a> '
+            f'<a href="/careers">Careers</a> <a href="https://www.linkedin.com/company/synthetic-{site}">LinkedIn</a></nav>'
+            f"<p>Email partnerships@sponsor{site}.example or call (555) 010-{site % 10000:04d}.</p>"
+        )
+        paragraphs = []
+        size = len(head)
+        while size < target_bytes:
+            paragraph = "<p>" + " ".join(page_random.choices(FILLER_WORDS, k=60)) + "</p>"
+            paragraphs.append(paragraph)
+            size += len(paragraph)
+        content = (head + "".join(paragraphs) + "</body></html>").encode("utf-8")
+
+        with self._pages_lock:
+            self._pages[key] = content
+        return content
+
+    def handle_error(self, request, client_address):
+        # The scraper hangs up once it has read enough of a page
+        error = sys.exc_info()[1]
+        if not isinstance(error, (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+    def serve(self) -> None:
+        """
+        Accept connections on the Serper address and every site address
+        until stop() is called.
+        """
+        selector = selectors.DefaultSelector()
+        self.socket.setblocking(False)
+        for listener in [self.socket] + self.site_sockets:
+            selector.register(listener, selectors.EVENT_READ)
+
+        while not self._stopped.is_set():
+            for key, _ in selector.select(0.2):
+                try:
+                    connection, client_address = key.fileobj.accept()
+                except BlockingIOError:
+                    continue
+                connection.setblocking(True)
+                self.process_request(connection, client_address)
+        selector.close()
+
+    def start(self) -> threading.Thread:
+        """
+        Serve on a background thread.
+        """
+        thread = threading.Thread(target=self.serve, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self._stopped.set()
+        for listener in self.site_sockets:
+            listener.close()
+        self.server_close()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if self.path != "/search" or self.server.sites_by_address.get(self.request.getsockname()) is not None:
+            self._send(404, "application/json", b"{}")
+            return
+
+        try:
+            query = json.loads(body).get("q", "")
+        except ValueError:
+            self._send(400, "application/json", b'{"message": "Invalid JSON"}')
+            return
+
+        time.sleep(self.server.sample_latency(self.server.serper_latency_ms, 0))
+        results = {"searchParameters": {"q": query}, "organic": self.server.results.get(query, [])}
+        self._send(200, "application/json", json.dumps(results).encode("utf-8"))
+
+    def do_GET(self):
+        site = self.server.sites_by_address.get(self.request.getsockname())
+        path = self.path.split("?")[0].rstrip("/") or "/"
+        if site is None or path not in SITE_PATHS:
+            self._send(404, "text/html", b"<html><body>Not found</body></html>")
+            return
+
+        time.sleep(self.server.sample_latency(self.server.latency_ms, self.server.latency_sigma))
+        self._send(200, "text/html; charset=utf-8", self.server.page(site, path))
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the stand-in server's settings to a command line parser.
+    """
+    parser.add_argument("--results-per-query", type=int, default=10, help="organic results per search query")
+    parser.add_argument("--page-kb", type=float, default=60, help="median homepage size in KB")
+    parser.add_argument("--page-sigma", type=float, default=0.5, help="log-normal sigma of page sizes")
+    parser.add_argument("--latency-ms", type=float, default=50, help="median site latency in ms")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="log-normal sigma of site latencies")
+    parser.add_argument("--serper-latency-ms", type=float, default=300, help="search response latency in ms")
+    parser.add_argument("--seed", type=int, default=1, help="random seed of the synthetic sites")
+
+
+def server_from_arguments(args: argparse.Namespace) -> StandInServer:
+    return StandInServer(
+        results_per_query=args.results_per_query,
+        page_kb=args.page_kb,
+        page_sigma=args.page_sigma,
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        serper_latency_ms=args.serper_latency_ms,
+        seed=args.seed
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for Serper and sponsor websites.")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = server_from_arguments(args)
+    # The first line tells the caller where to point the scraper
+    print(json.dumps({"serper_url": server.serper_url, "sites": server.site_count}), flush=True)
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,76 @@
+import hashlib
+import os
+import string
+import threading
+from typing import Dict, List, Tuple
+
+
+class CompiledTemplate:
+    """
+    A text template parsed once into literal segments and placeholders.
+
+    Placeholders use str.format syntax, e.g. {company_name}, and literal
+    braces are written as {{ and }}. Rendering only joins the precomputed
+    segments with the context values.
+    """
+
+    def __init__(self, source: str):
+        """
+        Args:
+            source: Template text
+
+        Raises:
+            ValueError: If the template uses format specs, conversions or attribute access
+        """
+        self.source = source
+        # Identifies the template text, e.g. to tell renders of old versions apart
+        self.version = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+        self.segments: List[Tuple[str, str]] = []
+        self.fields = set()
+
+        for literal, field, format_spec, conversion in string.Formatter().parse(source):
+            if field is not None and (format_spec or conversion or not field.isidentifier()):
+                raise ValueError(f"Unsupported placeholder in template: {{{field}}}")
+            self.segments.append((literal, field))
+            if field:
+                self.fields.add(field)
+
+    def render(self, context: Dict) -> str:
+        """
+        Render the template to a string.
+
+        Raises:
+            KeyError: If the context lacks a placeholder's value
+        """
+        parts = []
+        for literal, field in self.segments:
+            parts.append(literal)
+            if field:
+                parts.append(str(context[field]))
+        return "".join(parts)
+
+
+_compiled: Dict[str, Tuple[float, CompiledTemplate]] = {}
+_compiled_lock = threading.Lock()
+
+
+def load_template(path: str) -> CompiledTemplate:
+    """
+    Load and compile a template file.
+
+    Compiled templates are kept in memory and only re-parsed when the file's
+    modification time changes, so templates can be swapped on disk without
+    paying a parse on every render.
+    """
+    mtime = os.path.getmtime(path)
+    with _compiled_lock:
+        cached = _compiled.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    with open(path, "r", encoding="utf-8") as file:
+        template = CompiledTemplate(file.read())
+
+    with _compiled_lock:
+        _compiled[path] = (mtime, template)
+    return template
@@ -1,23 +1,52 @@
+import hashlib
 import json
+import multiprocessing
 import os
+import pathlib
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from typing import Dict, List, Optional, Tuple
-from pymongo import MongoClient
 from dotenv import load_dotenv
+from connections import get_database
+from metrics import TEMPLATE_RENDER_SECONDS, TEMPLATES_RENDERED, TEMPLATES_SKIPPED
+from sponsor_catalog import get_sponsor_catalog
+from template_engine import load_template
 
 # Load environment variables
 load_dotenv()
 
-# MongoDB connection
-MONGO_URI = os.getenv('MONGODB_URI')
-client = MongoClient(MONGO_URI)
-db = client['ber_scholarship_db']
-sponsors_collection = db['sponsors']
+# Email template source, compiled once and re-parsed only when the file changes
+BACKEND_DIR = pathlib.Path(__file__).parent.absolute()
+EMAIL_TEMPLATE_PATH = os.getenv('EMAIL_TEMPLATE_PATH', os.path.join(BACKEND_DIR, 'templates', 'sponsor_email.txt'))
+
+# Batch generation settings. TEMPLATE_POOL is 'process' or 'thread', and
+# TEMPLATE_WORKERS=1 renders serially in the calling thread, as do catalogs that
+# fit in a single chunk.
+TEMPLATE_WORKERS = int(os.getenv('TEMPLATE_WORKERS', str(os.cpu_count() or 1)))
+TEMPLATE_CHUNK_SIZE = int(os.getenv('TEMPLATE_CHUNK_SIZE', '1000'))
+TEMPLATE_POOL = os.getenv('TEMPLATE_POOL', 'process')
+# Process workers start from a clean forkserver process, or are spawned where
+# that isn't available. Forking the multithreaded web worker could copy locks
+# held by other threads, e.g. the template cache lock, and deadlock the child,
+# and pymongo clients must not be shared with forked children.
+TEMPLATE_POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+DEFAULT_BENEFITS = [
+    "Connect with talented engineering students",
+    "Showcase your products and technologies",
+    "Gain visibility at Formula SAE competitions",
+    "Support the next generation of automotive engineers"
+]
 
 def load_sponsors_data(file_path: str = None) -> List[Dict]:
     """
     Load the potential sponsors data from MongoDB.
     
+    The sponsors are served from the in-process catalog cache, which only
+    reloads them from MongoDB after the collection changed.
+    
     Args:
         file_path: Not used anymore, kept for backward compatibility
         
@@ -25,13 +54,48 @@ def load_sponsors_data(file_path: str = None) -> List[Dict]:
         List of sponsor dictionaries
     """
     try:
-        # Get all sponsors from MongoDB
-        sponsors = list(sponsors_collection.find({}, {'_id': 0}))
-        return sponsors
+        # Cached copy of the sponsors collection, reloaded when /api/scrape writes
+        return get_sponsor_catalog().get()
     except Exception as e:
         print(f"Error loading sponsors data from MongoDB: {e}")
         return []
 
+def find_sponsor(sponsor_name: str) -> Optional[Dict]:
+    """
+    Find a sponsor by name in MongoDB.
+    
+    Tries an exact match on the unique name index first, then a
+    case-insensitive prefix match, which is a range scan of the name_lower
+    index, and finally the best whole-word match from the name_text index,
+    e.g. "motion" finds "Garrett Motion". Every step is an indexed query.
+    
+    Args:
+        sponsor_name: Full name, start of the name or words of the name of the sponsor
+        
+    Returns:
+        Sponsor dictionary or None if no sponsor matches
+    """
+    try:
+        sponsors_collection = get_database()['sponsors']
+        sponsor = sponsors_collection.find_one({'name': sponsor_name}, {'_id': 0})
+        if sponsor is None:
+            sponsor = sponsors_collection.find_one(
+                {'name_lower': {'$regex': '^' + re.escape(sponsor_name.lower())}},
+                {'_id': 0}
+            )
+        if sponsor is None:
+            matches = sponsors_collection.find(
+                {'$text': {'$search': sponsor_name}},
+                {'_id': 0, 'score': {'$meta': 'textScore'}}
+            ).sort([('score', {'$meta': 'textScore'})]).limit(1)
+            sponsor = next(matches, None)
+            if sponsor is not None:
+                sponsor.pop('score', None)
+        return sponsor
+    except Exception as e:
+        print(f"Error finding sponsor in MongoDB: {e}")
+        return None
+
 def clean_company_name(name: str) -> str:
     """
     Clean the company name to be used in filenames.
@@ -64,7 +128,7 @@ def extract_company_info(sponsor: Dict) -> Tuple[str, str, Optional[str], Option
     
     return company_name, description, email, website
 
-def generate_email_template(
+def render_email_template(
     company_name: str,
     company_description: str,
     company_email: Optional[str],
@@ -79,10 +143,10 @@ def generate_email_template(
     team_mission: str = "[TEAM_MISSION]",
     specific_aspect: str = "[SPECIFIC_ASPECT]",
     additional_benefits: List[str] = None,
-    output_dir: str = "email_templates"
+    template_path: str = None
 ) -> str:
     """
-    Generate an email template for a specific company.
+    Render an email template for a specific company in memory.
     
     Args:
         company_name: Name of the company
@@ -99,10 +163,44 @@ def generate_email_template(
         team_mission: Mission of the team
         specific_aspect: Specific aspect of the company that aligns with the team
         additional_benefits: Additional benefits to include in the email
+        template_path: Template file to render, defaults to EMAIL_TEMPLATE_PATH
+        
+    Returns:
+        The rendered email
+    """
+    # Default benefits if none provided
+    if additional_benefits is None:
+        additional_benefits = DEFAULT_BENEFITS
+    
+    template = load_template(template_path or EMAIL_TEMPLATE_PATH)
+    return template.render({
+        "company_name": company_name,
+        "company_description": company_description,
+        "company_email": company_email or "",
+        "company_website": company_website or "your company website",
+        "club_description": club_description,
+        "university_description": university_description,
+        "user_name": user_name,
+        "user_position": user_position,
+        "user_email": user_email,
+        "user_phone": user_phone,
+        "team_website": team_website,
+        "team_mission": team_mission,
+        "specific_aspect": specific_aspect,
+        "benefits": "".join(f"- {benefit}\n" for benefit in additional_benefits)
+    })
+
+def save_template(company_name: str, template_content: str, output_dir: str = "email_templates") -> str:
+    """
+    Write a rendered email template to a file.
+    
+    Args:
+        company_name: Name of the company
+        template_content: Rendered email
         output_dir: Directory to save the template
         
     Returns:
-        Path to the generated template file
+        Path to the template file
     """
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
@@ -112,61 +210,182 @@ def generate_email_template(
     template_filename = f"{clean_name}_email_template.txt"
     template_path = os.path.join(output_dir, template_filename)
     
-    # Default benefits if none provided
-    if additional_benefits is None:
-        additional_benefits = [
-            "Connect with talented engineering students",
-            "Showcase your products and technologies",
-            "Gain visibility at Formula SAE competitions",
-            "Support the next generation of automotive engineers"
-        ]
-    
-    # Generate the email template
-    template = f"""Subject: Partnership Opportunity with {company_name} - University of Cincinnati Formula Racing Team
-
-Dear {company_name} Team,
-
-I hope this email finds you well. My name is {user_name}, and I am {user_position} with the University of Cincinnati Formula Racing Team.
-
-About Our Team:
-{club_description}
-
-About the University of Cincinnati:
-{university_description}
-
-About {company_name}:
-{company_description}
-
-We are reaching out to explore potential partnership opportunities with {company_name}. Your company's commitment to {specific_aspect} aligns perfectly with our team's mission to {team_mission}.
+    with open(template_path, 'w', encoding='utf-8') as file:
+        file.write(template_content)
+    
+    return template_path
 
-As a potential sponsor, you would have the opportunity to:
-"""
+def generate_email_template(
+    company_name: str,
+    company_description: str,
+    company_email: Optional[str],
+    company_website: Optional[str],
+    club_description: str,
+    university_description: str,
+    user_name: str = "[YOUR_NAME]",
+    user_position: str = "[YOUR_POSITION]",
+    user_email: str = "[YOUR_EMAIL]",
+    user_phone: str = "[YOUR_PHONE]",
+    team_website: str = "[TEAM_WEBSITE]",
+    team_mission: str = "[TEAM_MISSION]",
+    specific_aspect: str = "[SPECIFIC_ASPECT]",
+    additional_benefits: List[str] = None,
+    output_dir: str = "email_templates"
+) -> str:
+    """
+    Generate an email template for a specific company and save it to a file.
     
-    # Add benefits
-    for benefit in additional_benefits:
-        template += f"- {benefit}\n"
+    Takes the same arguments as render_email_template, plus output_dir, the
+    directory to save the template.
+        
+    Returns:
+        Path to the generated template file
+    """
+    template_content = render_email_template(
+        company_name=company_name,
+        company_description=company_description,
+        company_email=company_email,
+        company_website=company_website,
+        club_description=club_description,
+        university_description=university_description,
+        user_name=user_name,
+        user_position=user_position,
+        user_email=user_email,
+        user_phone=user_phone,
+        team_website=team_website,
+        team_mission=team_mission,
+        specific_aspect=specific_aspect,
+        additional_benefits=additional_benefits
+    )
     
-    template += f"""
-We would welcome the opportunity to discuss how a partnership could benefit both our team and {company_name}. Would you be available for a brief call or meeting to discuss this further?
+    return save_template(company_name, template_content, output_dir)
 
-Thank you for your time and consideration.
+def render_sponsor_chunk(
+    sponsors: List[Dict],
+    profile: Dict,
+    output_dir: Optional[str] = None
+) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    Render email templates for a chunk of sponsors. Runs in a batch worker.
+    
+    Args:
+        sponsors: Sponsor dictionaries
+        profile: Keyword arguments for render_email_template describing the team and user
+        output_dir: Directory to save the templates, or None to only render them
+        
+    Returns:
+        List of (company_name, rendered email, template path or None) tuples
+        in the same order as the sponsors
+    """
+    rendered = []
+    for sponsor in sponsors:
+        company_name, description, email, website = extract_company_info(sponsor)
+        
+        template_content = render_email_template(
+            company_name=company_name,
+            company_description=description,
+            company_email=email,
+            company_website=website,
+            **profile
+        )
+        template_path = save_template(company_name, template_content, output_dir) if output_dir else None
+        rendered.append((company_name, template_content, template_path))
+    return rendered
 
-Best regards,
-{user_name}
-University of Cincinnati Formula Racing Team
-{user_email}
-{user_phone}
+def template_input_hash(sponsor: Dict, profile: Dict, template_version: str) -> str:
+    """
+    Hash everything a sponsor's rendered template depends on.
+    
+    Args:
+        sponsor: Sponsor dictionary
+        profile: Keyword arguments for render_email_template describing the team and user
+        template_version: Version of the compiled email template
+        
+    Returns:
+        Hex digest that changes whenever the rendered template would change
+    """
+    inputs = {
+        "sponsor": extract_company_info(sponsor),
+        "profile": profile,
+        "template_version": template_version
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")).hexdigest()
 
-P.S. You can learn more about our team at {team_website} and about {company_name} at {company_website or "your company website"}.
-"""
+def render_batch(
+    profile: Dict,
+    output_dir: Optional[str] = None,
+    max_workers: int = None,
+    chunk_size: int = None,
+    pool: str = None,
+    known_hashes: Dict[str, str] = None
+) -> Tuple[List[Tuple[str, str, Optional[str], str]], List[str]]:
+    """
+    Render email templates for all sponsors, split into chunks across a pool
+    of workers.
     
-    # Save the template to a file
-    with open(template_path, 'w', encoding='utf-8') as file:
-        file.write(template)
+    Sponsors whose input hash (see template_input_hash) equals their entry in
+    known_hashes are skipped, since their stored template is still current.
     
-    return template_path
+    Args:
+        profile: Keyword arguments for render_email_template describing the team and user
+        output_dir: Directory to save the templates, or None to only render them
+        max_workers: Number of workers, defaults to TEMPLATE_WORKERS. 1 renders serially
+        chunk_size: Sponsors per chunk, defaults to TEMPLATE_CHUNK_SIZE
+        pool: 'process' or 'thread', defaults to TEMPLATE_POOL
+        known_hashes: Dictionary mapping sponsor names to the input hash of their stored template
+        
+    Returns:
+        Tuple of the rendered templates as (company_name, rendered email,
+        template path or None, input hash) tuples in catalog order, whatever
+        the number of workers, and the names of the skipped sponsors
+    """
+    start = time.perf_counter()
+    max_workers = max_workers or TEMPLATE_WORKERS
+    chunk_size = chunk_size or TEMPLATE_CHUNK_SIZE
+    pool = pool or TEMPLATE_POOL
+    known_hashes = known_hashes or {}
+    template_version = load_template(EMAIL_TEMPLATE_PATH).version
+    
+    sponsors = []
+    input_hashes = []
+    skipped = []
+    for sponsor in load_sponsors_data():
+        company_name = sponsor.get("name", "Unknown Company")
+        
+        # Skip entries that don't look like actual companies
+        if "reddit.com" in company_name or "quora.com" in company_name:
+            continue
+        
+        input_hash = template_input_hash(sponsor, profile, template_version)
+        if known_hashes.get(company_name) == input_hash:
+            skipped.append(company_name)
+            continue
+        
+        sponsors.append(sponsor)
+        input_hashes.append(input_hash)
+    
+    chunks = [sponsors[start:start + chunk_size] for start in range(0, len(sponsors), chunk_size)]
+    
+    if max_workers <= 1 or len(chunks) <= 1:
+        results = [render_sponsor_chunk(chunk, profile, output_dir) for chunk in chunks]
+    else:
+        workers = min(max_workers, len(chunks))
+        if pool == "process":
+            executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(TEMPLATE_POOL_START_METHOD))
+        else:
+            executor = ThreadPoolExecutor(workers)
+        with executor:
+            # map keeps the chunks in order, so output is deterministic
+            results = list(executor.map(render_sponsor_chunk, chunks, repeat(profile), repeat(output_dir)))
+    
+    rendered = [item for chunk_result in results for item in chunk_result]
+    # Recorded here rather than per chunk, since chunks may render in worker processes
+    TEMPLATE_RENDER_SECONDS.observe(time.perf_counter() - start, mode="batch")
+    TEMPLATES_RENDERED.inc(len(rendered))
+    TEMPLATES_SKIPPED.inc(len(skipped))
+    return [item + (input_hash,) for item, input_hash in zip(rendered, input_hashes)], skipped
 
-def generate_templates_for_all_sponsors(
+def render_templates_for_all_sponsors(
     club_description: str,
     university_description: str,
     user_name: str = "[YOUR_NAME]",
@@ -177,10 +396,10 @@ def generate_templates_for_all_sponsors(
     team_mission: str = "[TEAM_MISSION]",
     specific_aspect: str = "[SPECIFIC_ASPECT]",
     additional_benefits: List[str] = None,
-    output_dir: str = "email_templates"
+    max_workers: int = None
 ) -> Dict[str, str]:
     """
-    Generate email templates for all sponsors in the data.
+    Render email templates for all sponsors in the data, in memory.
     
     Args:
         club_description: Description of the club
@@ -193,22 +412,107 @@ def generate_templates_for_all_sponsors(
         team_mission: Mission of the team
         specific_aspect: Specific aspect of the company that aligns with the team
         additional_benefits: Additional benefits to include in the email
-        output_dir: Directory to save the templates
+        max_workers: Number of batch workers, defaults to TEMPLATE_WORKERS
+        
+    Returns:
+        Dictionary mapping sponsor names to rendered emails
+    """
+    profile = {
+        "club_description": club_description,
+        "university_description": university_description,
+        "user_name": user_name,
+        "user_position": user_position,
+        "user_email": user_email,
+        "user_phone": user_phone,
+        "team_website": team_website,
+        "team_mission": team_mission,
+        "specific_aspect": specific_aspect,
+        "additional_benefits": additional_benefits
+    }
+    
+    rendered, _ = render_batch(profile, max_workers=max_workers)
+    return {company_name: template_content for company_name, template_content, _, _ in rendered}
+
+def generate_templates_for_all_sponsors(
+    club_description: str,
+    university_description: str,
+    user_name: str = "[YOUR_NAME]",
+    user_position: str = "[YOUR_POSITION]",
+    user_email: str = "[YOUR_EMAIL]",
+    user_phone: str = "[YOUR_PHONE]",
+    team_website: str = "[TEAM_WEBSITE]",
+    team_mission: str = "[TEAM_MISSION]",
+    specific_aspect: str = "[SPECIFIC_ASPECT]",
+    additional_benefits: List[str] = None,
+    output_dir: str = "email_templates",
+    max_workers: int = None
+) -> Dict[str, str]:
+    """
+    Generate email templates for all sponsors in the data and save them to files.
+    
+    Takes the same arguments as render_templates_for_all_sponsors, plus
+    output_dir, the directory to save the templates. Rendering and writing
+    both happen in the batch workers.
         
     Returns:
         Dictionary mapping sponsor names to template paths
     """
-    sponsors = load_sponsors_data()
-    template_paths = {}
+    profile = {
+        "club_description": club_description,
+        "university_description": university_description,
+        "user_name": user_name,
+        "user_position": user_position,
+        "user_email": user_email,
+        "user_phone": user_phone,
+        "team_website": team_website,
+        "team_mission": team_mission,
+        "specific_aspect": specific_aspect,
+        "additional_benefits": additional_benefits
+    }
     
-    for sponsor in sponsors:
-        company_name, description, email, website = extract_company_info(sponsor)
+    rendered, _ = render_batch(profile, output_dir=output_dir, max_workers=max_workers)
+    return {company_name: template_path for company_name, _, template_path, _ in rendered}
+
+def render_template_for_specific_sponsor(
+    sponsor_name: str,
+    club_description: str,
+    university_description: str,
+    user_name: str = "[YOUR_NAME]",
+    user_position: str = "[YOUR_POSITION]",
+    user_email: str = "[YOUR_EMAIL]",
+    user_phone: str = "[YOUR_PHONE]",
+    team_website: str = "[TEAM_WEBSITE]",
+    team_mission: str = "[TEAM_MISSION]",
+    specific_aspect: str = "[SPECIFIC_ASPECT]",
+    additional_benefits: List[str] = None
+) -> Optional[Tuple[str, str]]:
+    """
+    Render an email template for a specific sponsor by name, in memory.
+    
+    Args:
+        sponsor_name: Name of the sponsor to find
+        club_description: Description of the club
+        university_description: Description of the university
+        user_name: Name of the user sending the email
+        user_position: Position of the user in the team
+        user_email: Email of the user
+        user_phone: Phone number of the user
+        team_website: Website of the team
+        team_mission: Mission of the team
+        specific_aspect: Specific aspect of the company that aligns with the team
+        additional_benefits: Additional benefits to include in the email
         
-        # Skip entries that don't look like actual companies
-        if "reddit.com" in company_name or "quora.com" in company_name:
-            continue
-            
-        template_path = generate_email_template(
+    Returns:
+        Tuple of (company_name, rendered email) or None if sponsor not found
+    """
+    sponsor = find_sponsor(sponsor_name)
+    if sponsor is None:
+        return None
+    
+    company_name, description, email, website = extract_company_info(sponsor)
+    
+    with TEMPLATE_RENDER_SECONDS.time(mode="single"):
+        template_content = render_email_template(
             company_name=company_name,
             company_description=description,
             company_email=email,
@@ -222,13 +526,11 @@ def generate_templates_for_all_sponsors(
             team_website=team_website,
             team_mission=team_mission,
             specific_aspect=specific_aspect,
-            additional_benefits=additional_benefits,
-            output_dir=output_dir
+            additional_benefits=additional_benefits
         )
-        
-        template_paths[company_name] = template_path
+    TEMPLATES_RENDERED.inc()
     
-    return template_paths
+    return company_name, template_content
 
 def generate_template_for_specific_sponsor(
     sponsor_name: str,
@@ -245,52 +547,32 @@ def generate_template_for_specific_sponsor(
     output_dir: str = "email_templates"
 ) -> Optional[str]:
     """
-    Generate an email template for a specific sponsor by name.
+    Generate an email template for a specific sponsor by name and save it to a file.
     
-    Args:
-        sponsor_name: Name of the sponsor to find
-        club_description: Description of the club
-        university_description: Description of the university
-        user_name: Name of the user sending the email
-        user_position: Position of the user in the team
-        user_email: Email of the user
-        user_phone: Phone number of the user
-        team_website: Website of the team
-        team_mission: Mission of the team
-        specific_aspect: Specific aspect of the company that aligns with the team
-        additional_benefits: Additional benefits to include in the email
-        output_dir: Directory to save the template
+    Takes the same arguments as render_template_for_specific_sponsor, plus
+    output_dir, the directory to save the template.
         
     Returns:
         Path to the generated template file or None if sponsor not found
     """
-    sponsors = load_sponsors_data()
-    
-    for sponsor in sponsors:
-        if sponsor_name.lower() in sponsor.get("name", "").lower():
-            company_name, description, email, website = extract_company_info(sponsor)
-            
-            template_path = generate_email_template(
-                company_name=company_name,
-                company_description=description,
-                company_email=email,
-                company_website=website,
-                club_description=club_description,
-                university_description=university_description,
-                user_name=user_name,
-                user_position=user_position,
-                user_email=user_email,
-                user_phone=user_phone,
-                team_website=team_website,
-                team_mission=team_mission,
-                specific_aspect=specific_aspect,
-                additional_benefits=additional_benefits,
-                output_dir=output_dir
-            )
-            
-            return template_path
+    rendered = render_template_for_specific_sponsor(
+        sponsor_name=sponsor_name,
+        club_description=club_description,
+        university_description=university_description,
+        user_name=user_name,
+        user_position=user_position,
+        user_email=user_email,
+        user_phone=user_phone,
+        team_website=team_website,
+        team_mission=team_mission,
+        specific_aspect=specific_aspect,
+        additional_benefits=additional_benefits
+    )
+    if rendered is None:
+        return None
     
-    return None
+    company_name, template_content = rendered
+    return save_template(company_name, template_content, output_dir)
 
 def get_template_content(template_path: str) -> str:
     """
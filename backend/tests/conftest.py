@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Keep the on-disk caches and run checkpoints of the tests out of backend/data.
+# Set before the backend modules read them, load_dotenv() doesn't override them.
+_DATA_DIR = tempfile.mkdtemp(prefix="ber-tests-")
+os.environ.setdefault("SEARCH_CACHE_PATH", os.path.join(_DATA_DIR, "search_cache.sqlite3"))
+os.environ.setdefault("SCRAPE_RUNS_DIR", os.path.join(_DATA_DIR, "runs"))
+os.environ.setdefault("HTTP_CACHE_DIR", os.path.join(_DATA_DIR, "http_cache"))
+os.environ.setdefault("SIMILARITY_INDEX_PATH", os.path.join(_DATA_DIR, "similarity_index.npz"))
+os.environ.setdefault("SCRAPER_DATA_DIR", os.path.join(_DATA_DIR, "scraper"))
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+
+
+@pytest.fixture
+def db():
+    """
+    Fresh in-process mongomock database, shared through connections.
+    """
+    mongomock = pytest.importorskip("mongomock")
+    import connections
+
+    connections.use_mongo_client(mongomock.MongoClient())
+    return connections.get_database()
+
+
+@pytest.fixture
+def client(db):
+    """
+    Flask test client of the API backed by the db fixture.
+    """
+    import app as backend_app
+
+    # Indexes are checked once per process, redo it for the new database
+    backend_app.indexes_checked = False
+    return backend_app.app.test_client()
@@ -0,0 +1,56 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import checkpoint
+from checkpoint import ScrapeCheckpoint, latest_unfinished_run
+from scrape_jobs import recorded_job
+
+
+def age_run(runs_dir, run_id, seconds):
+    path = os.path.join(runs_dir, run_id, "run.json")
+    with open(path, encoding="utf-8") as f:
+        progress = json.load(f)
+    progress["updated_at"] = (datetime.utcnow() - timedelta(seconds=seconds)).isoformat()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(progress, f)
+
+
+def test_resumed_run_skips_finished_searches_and_fetches(tmp_path):
+    runs_dir = str(tmp_path)
+    run = ScrapeCheckpoint(run_id="run-1", runs_dir=runs_dir)
+    run.start(queries_total=2)
+    run.recording_search(lambda query: {"organic": [query]})("first query")
+    run.recording_fetch(lambda url: {"email": "a@example.com"})("https://example.com/")
+    # Failed fetches aren't recorded, so a resumed run retries them
+    run.recording_fetch(lambda url: {})("https://down.example.com/")
+
+    resumed = ScrapeCheckpoint.load("run-1", runs_dir)
+    calls = []
+    fetch = resumed.recording_fetch(lambda url: calls.append(url) or {"email": "b@example.com"})
+
+    assert resumed.completed_queries == {"first query": {"organic": ["first query"]}}
+    assert fetch("https://example.com/") == {"email": "a@example.com"}
+    fetch("https://down.example.com/")
+    assert calls == ["https://down.example.com/"]
+
+
+def test_latest_unfinished_run_skips_runs_active_in_another_worker(tmp_path):
+    runs_dir = str(tmp_path)
+    ScrapeCheckpoint(run_id="20240101-000000-dead", runs_dir=runs_dir).update(status="running")
+    age_run(runs_dir, "20240101-000000-dead", checkpoint.RUN_STALE_SECONDS + 1)
+    ScrapeCheckpoint(run_id="20240102-000000-live", runs_dir=runs_dir).update(status="running")
+
+    assert latest_unfinished_run(runs_dir) == "20240101-000000-dead"
+
+
+def test_recorded_job_of_a_stale_run_is_interrupted(tmp_path):
+    runs_dir = str(tmp_path)
+    ScrapeCheckpoint(run_id="stale", runs_dir=runs_dir).update(status="running")
+    ScrapeCheckpoint(run_id="fresh", runs_dir=runs_dir).update(status="running")
+    age_run(runs_dir, "stale", checkpoint.RUN_STALE_SECONDS + 1)
+
+    stale = recorded_job("stale", runs_dir)
+    assert stale["status"] == "interrupted"
+    assert stale["finished_at"] is not None
+    assert recorded_job("fresh", runs_dir)["status"] == "running"
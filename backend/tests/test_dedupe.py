@@ -0,0 +1,42 @@
+from dedupe import SponsorIndex, normalize_name, registrable_domain
+
+
+def test_normalize_name_drops_case_punctuation_and_legal_form():
+    assert normalize_name("MWS Wire Industries, Inc.") == "mws wire industries"
+    assert normalize_name("Bosch GmbH") == "bosch"
+    assert normalize_name("  Tesla  ") == "tesla"
+
+
+def test_registrable_domain():
+    assert registrable_domain("https://www.mwswire.com/contact/") == "mwswire.com"
+    assert registrable_domain("https://shop.example.co.uk/") == "example.co.uk"
+    assert registrable_domain("http://127.0.0.1:8080/about") == "127.0.0.1"
+    assert registrable_domain("not a url") is None
+
+
+def test_index_merges_same_domain_under_another_name():
+    index = SponsorIndex()
+
+    assert index.add({"name": "MWS Wire", "website": "https://mwswire.com/"})
+    assert not index.add({"name": "MWS Wire Industries", "website": "https://www.mwswire.com/about", "email": "a@mwswire.com"})
+
+    assert len(index) == 1
+    sponsor = index.sponsors[0]
+    assert sponsor["email"] == "a@mwswire.com"
+    assert sponsor["aliases"] == ["MWS Wire Industries"]
+
+
+def test_index_merges_same_name_on_other_domains():
+    index = SponsorIndex()
+    index.add({"name": "Bosch GmbH", "website": "https://bosch.de/"})
+
+    assert not index.add({"name": "Bosch", "website": "https://bosch.com/"})
+    assert len(index) == 1
+
+
+def test_index_keeps_companies_on_shared_domains_apart():
+    index = SponsorIndex()
+
+    assert index.add({"name": "Team sponsors thread", "website": "https://www.reddit.com/r/FSAE/1"})
+    assert index.add({"name": "Battery suppliers thread", "website": "https://www.reddit.com/r/FSAE/2"})
+    assert len(index) == 2
@@ -0,0 +1,49 @@
+from fit_scoring import FitScorer, default_scorer, update_fit_scores
+
+
+def test_keywords_match_whole_words_only():
+    analysis = default_scorer.analyze([{"description": "An agreement on electric vehicles"}])[0]
+
+    assert analysis["reasons"] == ["Company is related to electric", "Company is related to vehicle"]
+    assert analysis["score"] == 10
+
+
+def test_scores_are_capped():
+    scorer = FitScorer(keyword_weights=[50] * 11)
+    description = "automotive engineering racing"
+
+    assert scorer.analyze([{"description": description}])[0]["score"] == 100
+
+
+def test_zero_weight_features_are_not_reported():
+    scorer = FitScorer(keywords=["racing"], keyword_weights=[0], contact_weight=0)
+
+    analysis = scorer.analyze([{"description": "racing", "email": "a@example.com", "careers_page": "/careers"}])[0]
+
+    assert analysis["reasons"] == ["Company has a careers page, indicating they invest in talent"]
+
+
+def test_update_fit_scores_only_rescores_changed_sponsors(db):
+    sponsors = db["sponsors"]
+    sponsors.insert_many([
+        {"name": "Volt Racing", "description": "electric racing"},
+        {"name": "Cell Co", "description": "battery cells"}
+    ])
+
+    assert update_fit_scores(sponsors) == {"scored": 2, "unchanged": 0}
+    assert update_fit_scores(sponsors) == {"scored": 0, "unchanged": 2}
+
+    sponsors.update_one({"name": "Cell Co"}, {"$set": {"email": "hello@cell.example.com"}})
+    assert update_fit_scores(sponsors) == {"scored": 1, "unchanged": 1}
+    assert sponsors.find_one({"name": "Cell Co"})["fit_score"] == 15
+
+
+def test_weight_change_rescores_every_sponsor_from_cached_features(db):
+    sponsors = db["sponsors"]
+    sponsors.insert_many([{"name": f"Sponsor {i}", "description": "green energy"} for i in range(3)])
+    update_fit_scores(sponsors)
+
+    heavier = FitScorer(keyword_weights=[20] * 11)
+    assert heavier.feature_cache is default_scorer.feature_cache
+    assert update_fit_scores(sponsors, scorer=heavier) == {"scored": 3, "unchanged": 0}
+    assert {sponsor["fit_score"] for sponsor in sponsors.find()} == {40}
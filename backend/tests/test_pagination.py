@@ -0,0 +1,62 @@
+import json
+
+
+def seed_sponsors(db, count):
+    db["sponsors"].insert_many([
+        {"name": f"Sponsor {i:03d}", "description": f"Description {i}", "website": f"https://sponsor{i}.example.com/"}
+        for i in range(count)
+    ])
+
+
+def test_pages_cover_every_sponsor_once(client, db):
+    seed_sponsors(db, 25)
+
+    names = []
+    cursor = None
+    while True:
+        query = f"/api/sponsors?limit=10&cursor={cursor}" if cursor else "/api/sponsors?limit=10"
+        body = client.get(query).get_json()
+        names.extend(sponsor["name"] for sponsor in body["sponsors"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert names == [f"Sponsor {i:03d}" for i in range(25)]
+
+
+def test_fields_select_returned_fields(client, db):
+    seed_sponsors(db, 3)
+
+    body = client.get("/api/sponsors?limit=2&fields=name").get_json()
+
+    assert body["sponsors"] == [{"name": "Sponsor 000"}, {"name": "Sponsor 001"}]
+
+
+def test_ndjson_pages_carry_cursor_in_header(client, db):
+    seed_sponsors(db, 3)
+
+    first = client.get("/api/sponsors?limit=2&format=ndjson")
+    lines = [json.loads(line) for line in first.get_data(as_text=True).splitlines()]
+    assert [line["name"] for line in lines] == ["Sponsor 000", "Sponsor 001"]
+    assert first.mimetype == "application/x-ndjson"
+
+    last = client.get(f"/api/sponsors?limit=2&format=ndjson&cursor={first.headers['X-Next-Cursor']}")
+    assert [json.loads(line)["name"] for line in last.get_data(as_text=True).splitlines()] == ["Sponsor 002"]
+    assert "X-Next-Cursor" not in last.headers
+
+
+def test_unpaginated_read_streams_everything(client, db):
+    seed_sponsors(db, 5)
+
+    body = client.get("/api/sponsors").get_json()
+
+    assert body["success"] is True
+    assert len(body["sponsors"]) == 5
+    assert "next_cursor" not in body
+
+
+def test_malformed_cursor_is_rejected(client, db):
+    response = client.get("/api/sponsors?cursor=not-an-id")
+
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Invalid cursor"
@@ -0,0 +1,31 @@
+import search_cache
+from search_cache import SearchCache, cache_key
+
+URL = "https://google.serper.dev/search"
+
+
+def test_cached_response_is_returned_until_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(search_cache.time, "time", lambda: now[0])
+    cache = SearchCache(path=str(tmp_path / "cache.sqlite3"), ttl=60)
+
+    cache.put(URL, {"q": "formula student sponsors"}, {"organic": []})
+
+    now[0] += 59
+    assert cache.get(URL, {"q": "formula student sponsors"}) == {"organic": []}
+    now[0] += 1
+    assert cache.get(URL, {"q": "formula student sponsors"}) is None
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    SearchCache(path=path, ttl=60).put(URL, {"q": "ev battery"}, {"organic": [1]})
+
+    assert SearchCache(path=path, ttl=60).get(URL, {"q": "ev battery"}) == {"organic": [1]}
+
+
+def test_cache_key_depends_on_parameters_not_their_order():
+    assert cache_key(URL, {"q": "a", "num": 10}) == cache_key(URL, {"num": 10, "q": "a"})
+    assert cache_key(URL, {"q": "a"}) != cache_key(URL, {"q": "b"})
+    assert cache_key(URL, {"q": "a"}) != cache_key("https://example.com/search", {"q": "a"})
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+import search_stage
+from search_cache import SearchCache
+from search_stage import TokenBucket, run_searches
+
+
+def test_token_bucket_allows_a_burst_without_waiting():
+    bucket = TokenBucket(rate=1, capacity=5)
+
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.1
+
+
+def test_token_bucket_waits_for_refill_once_empty():
+    bucket = TokenBucket(rate=20, capacity=1)
+    bucket.acquire()
+
+    start = time.monotonic()
+    bucket.acquire()
+    bucket.acquire()
+    # Two tokens at 20 per second
+    assert time.monotonic() - start >= 0.09
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)
+
+
+def test_run_searches_keeps_query_order():
+    queries = [f"query {i}" for i in range(10)]
+
+    results = run_searches(queries, lambda query: {"q": query}, max_workers=4)
+
+    assert results == [(query, {"q": query}) for query in queries]
+    assert run_searches([], lambda query: None) == []
+
+
+def test_run_searches_takes_a_token_per_search():
+    taken = []
+    lock = threading.Lock()
+
+    class CountingLimiter:
+        def acquire(self):
+            with lock:
+                taken.append(1)
+
+    run_searches(["a", "b", "c"], lambda query: None, limiter=CountingLimiter())
+
+    assert len(taken) == 3
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, url, headers=None, json=None):
+        self.posts.append(json["q"])
+        return FakeResponse({"organic": [{"title": json["q"]}]})
+
+
+@pytest.fixture
+def serper(monkeypatch, tmp_path):
+    """
+    Fake Serper session and an empty search cache for perform_search.
+    """
+    session = FakeSession()
+    cache = SearchCache(path=str(tmp_path / "search_cache.sqlite3"), ttl=60)
+    monkeypatch.setattr(search_stage, "get_serper_session", lambda: session)
+    monkeypatch.setattr(search_stage, "get_search_cache", lambda: cache)
+    monkeypatch.setattr(search_stage, "serper_limiter", TokenBucket(rate=1000, capacity=1000))
+    return session
+
+
+def test_perform_search_serves_repeated_queries_from_cache(serper):
+    first = search_stage.perform_search("electric racing sponsors")
+    second = search_stage.perform_search("electric racing sponsors")
+
+    assert first == second == {"organic": [{"title": "electric racing sponsors"}]}
+    assert serper.posts == ["electric racing sponsors"]
+
+
+def test_perform_search_force_refresh_bypasses_cache(serper):
+    search_stage.perform_search("battery suppliers")
+    search_stage.perform_search("battery suppliers", force_refresh=True)
+
+    assert serper.posts == ["battery suppliers", "battery suppliers"]
@@ -0,0 +1,28 @@
+import { NextResponse } from 'next/server';
+
+export async function GET(request: Request, { params }: { params: Promise<{ jobId: string }> }) {
+  try {
+    const { jobId } = await params;
+
+    // Proxy the job status request to the Flask backend
+    const response = await fetch(`http://localhost:5000/api/scrape/jobs/${encodeURIComponent(jobId)}`);
+
+    try {
+      const data = await response.json();
+      return NextResponse.json(data, { status: response.status });
+    } catch (jsonError) {
+      // If not JSON, it might be HTML or other format
+      console.error('Received non-JSON response from scrape job status');
+      return NextResponse.json({ 
+        success: false,
+        message: `Backend error: ${response.status} ${response.statusText}. Make sure the Flask backend is running.`
+      }, { status: response.ok ? 500 : response.status });
+    }
+  } catch (error) {
+    console.error('API route error:', error);
+    return NextResponse.json({ 
+      success: false,
+      message: error instanceof Error ? error.message : 'Unknown error. Make sure the Flask backend is running.'
+    }, { status: 500 });
+  }
+}
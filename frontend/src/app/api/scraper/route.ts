@@ -1,18 +1,22 @@
 import { NextResponse } from 'next/server';
 
-export async function GET() {
-  return handleScrapeRequest();
+export async function GET(request: Request) {
+  return handleScrapeRequest(request);
 }
 
-export async function POST() {
-  return handleScrapeRequest();
+export async function POST(request: Request) {
+  return handleScrapeRequest(request);
 }
 
-async function handleScrapeRequest() {
+async function handleScrapeRequest(request: Request) {
   try {
+    // Forward ?refresh=true so callers can bypass cached search results
+    const refresh = new URL(request.url).searchParams.get('refresh');
+    const query = refresh ? `?refresh=${encodeURIComponent(refresh)}` : '';
+
     // Call the Flask backend's scrape endpoint
-    const response = await fetch('http://localhost:5000/api/scrape', {
-      method: 'GET',
+    const response = await fetch(`http://localhost:5000/api/scrape${query}`, {
+      method: 'POST',
       headers: {
         'Content-Type': 'application/json',
       },
@@ -38,22 +42,15 @@ async function handleScrapeRequest() {
       }
     }
 
-    // Try to parse the response as JSON
-    try {
-      const data = await response.json();
-      return NextResponse.json({ 
-        success: true,
-        results: data 
-      });
-    } catch (jsonError) {
-      // If not JSON, it might be HTML or other format
-      const text = await response.text();
-      console.error('Received non-JSON response:', text.substring(0, 200) + '...');
-      return NextResponse.json({ 
-        success: false,
-        message: 'Backend returned non-JSON response. Make sure the Flask backend is running correctly.'
-      }, { status: 500 });
-    }
+    // The backend runs the scrape as a background job. Hand its id to the
+    // find page, which polls /api/scraper/jobs/<job_id> until it finishes,
+    // so this request returns right away instead of lasting the whole scrape.
+    const data = await response.json();
+    return NextResponse.json({
+      success: true,
+      job_id: data.job_id,
+      job: data.job
+    }, { status: 202 });
   } catch (error) {
     console.error('API route error:', error);
     return NextResponse.json({ 
@@ -61,4 +58,4 @@ async function handleScrapeRequest() {
       message: error instanceof Error ? error.message : 'Unknown error. Make sure the Flask backend is running.'
     }, { status: 500 });
   }
-} 
\ No newline at end of file
+}
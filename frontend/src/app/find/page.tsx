@@ -29,6 +29,26 @@ interface Sponsor {
 
 type SortOrder = 'highest' | 'lowest' | 'none';
 
+// How often and for how long the find page follows a scrape job
+const SCRAPE_POLL_INTERVAL_MS = 2000;
+const SCRAPE_TIMEOUT_MS = 30 * 60 * 1000;
+
+async function waitForScrapeJob(jobId: string) {
+  const deadline = Date.now() + SCRAPE_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    await new Promise((resolve) => setTimeout(resolve, SCRAPE_POLL_INTERVAL_MS));
+    const response = await fetch(`/api/scraper/jobs/${encodeURIComponent(jobId)}`);
+    const data = await response.json();
+    if (!response.ok) {
+      throw new Error(data.message || 'Failed to get scrape job status');
+    }
+    if (['completed', 'failed', 'interrupted'].includes(data.job.status)) {
+      return data.job;
+    }
+  }
+  throw new Error('The scrape is taking longer than expected. It keeps running in the background, check back later.');
+}
+
 export default function FindScholarships() {
   const [isScraping, setIsScraping] = useState(false);
   const [sponsors, setSponsors] = useState<Sponsor[]>([]);
@@ -103,6 +123,15 @@ export default function FindScholarships() {
         throw new Error(data.message || 'Failed to scrape sponsors');
       }
       
+      // The scrape runs as a background job, wait for it to finish
+      const job = await waitForScrapeJob(data.job_id);
+      if (job.status === 'failed') {
+        throw new Error(job.error || 'Scrape job failed');
+      }
+      if (job.status === 'interrupted') {
+        throw new Error('The scrape was interrupted. Start it again to resume where it stopped.');
+      }
+      
       // After successful scraping, fetch the updated sponsors
       await fetchSponsors();
     } catch (err) {